@@ -0,0 +1,163 @@
+# image_models/async_ocr_processor.py
+
+import asyncio
+import contextlib
+import logging
+import time
+
+import aiohttp
+
+from image_models.form_stream import FORM_CONTENT_TYPE
+from image_models.ocr_client import backoff_delay
+from image_models.page_image import PageImage
+
+
+class TokenBucket:
+    """令牌桶限速：平均每秒 rate 个请求，允许 capacity 个突发"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class AsyncImageOCRProcessor:
+    """ImageOCRProcessor 的 asyncio 上传层：单个事件循环内并发数百个请求，令牌桶限速
+
+    缓存、上传前缩放与表单字段都交给传入的 ImageOCRProcessor，两者行为一致；
+    需要预处理或分块的页面整页交给它在线程中处理，经由其同步客户端上传。
+    """
+
+    def __init__(self, processor, requests_per_second=5.0, max_in_flight=32, connect_timeout=5.0,
+                 read_timeout=60.0, max_retries=3, backoff_base=0.5, backoff_max=8.0):
+        self.processor = processor
+        self.url = processor.client.url
+        self.requests_per_second = requests_per_second
+        self.max_in_flight = max_in_flight
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = {'requests': 0, 'retries': 0, 'server_errors': 0, 'connection_errors': 0, 'failures': 0}
+        self._session = None
+        self._bucket = None
+        self._semaphore = None
+
+    def _log(self, message, level=logging.INFO):
+        if self.processor.log_box is not None:
+            self.processor.log_box.log(message, level)
+
+    def get_stats(self):
+        return dict(self.stats)
+
+    @contextlib.asynccontextmanager
+    async def running(self):
+        """在当前事件循环中打开会话；process_page 须在其中调用"""
+        self._bucket = TokenBucket(self.requests_per_second)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight)
+        async with aiohttp.ClientSession(connector=connector, timeout=self.timeout) as session:
+            self._session = session
+            try:
+                yield self
+            finally:
+                self._session = None
+
+    async def _post(self, body):
+        # 请求体按块流式发送，长度预先算好，避免退化为 chunked 编码
+        headers = {'Content-Type': FORM_CONTENT_TYPE, 'Content-Length': str(await asyncio.to_thread(len, body))}
+        attempt = 0
+        while True:
+            await self._bucket.acquire()
+            self.stats['requests'] += 1
+            body.rewind()
+            try:
+                async with self._session.post(self.url, data=body.aiter_chunks(), headers=headers) as response:
+                    if response.status < 500 or attempt >= self.max_retries:
+                        if response.status == 200:
+                            return await response.json(content_type=None)
+                        if response.status >= 500:
+                            self.stats['server_errors'] += 1
+                        self.stats['failures'] += 1
+                        self._log(f'响应失败，状态码：{response.status}', logging.ERROR)
+                        self._log(await response.text(), logging.ERROR)
+                        return None
+                    self.stats['server_errors'] += 1
+                    reason = f'服务器错误，状态码：{response.status}'
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                self.stats['connection_errors'] += 1
+                if attempt >= self.max_retries:
+                    self.stats['failures'] += 1
+                    self._log(f'请求失败：{e!r}', logging.ERROR)
+                    return None
+                reason = f'连接错误：{e!r}'
+
+            delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+            attempt += 1
+            self.stats['retries'] += 1
+            self._log(f'{reason}，{delay:.1f} 秒后第 {attempt} 次重试', logging.WARNING)
+            await asyncio.sleep(delay)
+
+    async def process_page(self, image, image_size, char_ocr, det_mode, return_position, return_choices):
+        """
+        Args:
+            image: 图像路径或 PageImage
+        Returns:
+            OCR 响应，失败时为 None
+        """
+        processor = self.processor
+        page_image = PageImage.of(image)
+        ocr_args = (image_size, char_ocr, det_mode, return_position, return_choices)
+        async with self._semaphore:
+            if await asyncio.to_thread(processor.uses_local_steps, page_image):
+                return await asyncio.to_thread(processor.process_single_image, page_image, *ocr_args)
+
+            image_file = page_image.encoded()
+            try:
+                digest = await asyncio.to_thread(page_image.digest) if processor.cache is not None else None
+                request = await asyncio.to_thread(processor.prepare_request, image_file, *ocr_args, digest)
+                if request.cached is not None:
+                    return request.cached
+                result = await self._post(request.body)
+            finally:
+                image_file.close()
+
+        if result is not None:
+            await asyncio.to_thread(processor.store_response, request, result)
+        return result
+
+    async def process_many(self, paths, image_size, char_ocr, det_mode, return_position, return_choices,
+                           on_result=None):
+        """
+        并发识别多张图像
+
+        Args:
+            paths: 图像路径列表
+            on_result: 每完成一张回调 on_result(index, response)，完成顺序不保证
+        Returns:
+            与 paths 顺序一致的响应列表，失败项为 None
+        """
+        async with self.running():
+            async def run(index, image_path):
+                response = await self.process_page(image_path, image_size, char_ocr, det_mode,
+                                                   return_position, return_choices)
+                if on_result:
+                    on_result(index, response)
+                return response
+
+            return await asyncio.gather(*(run(i, path) for i, path in enumerate(paths)))
@@ -0,0 +1,225 @@
+# image_models/batch_ocr.py
+
+import asyncio
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from image_models.page_image import PageImage
+from image_models.process_pool import shared_process_pool
+from image_processor import ImageProcessor, post_process_page
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp')
+
+
+def _natural_key(path):
+    """按自然顺序排序（page-2 排在 page-10 之前）"""
+    name = os.path.basename(path)
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+def collect_image_paths(source):
+    """将目录或路径列表展开为按页码排序的图像文件列表"""
+    if isinstance(source, (str, os.PathLike)):
+        source = [source]
+
+    paths = []
+    for item in source:
+        if os.path.isdir(item):
+            found = [os.path.join(item, name) for name in os.listdir(item)
+                     if name.lower().endswith(IMAGE_EXTENSIONS)]
+            paths.extend(sorted(found, key=_natural_key))
+        else:
+            paths.append(item)
+    return paths
+
+
+class PageResult:
+    """单页的识别与后处理结果"""
+
+    def __init__(self, index, image_path):
+        self.index = index
+        self.image_path = image_path
+        self.page_image = None
+        self.response = None
+        self.page = None
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None and self.response is not None
+
+
+class BatchOCREngine:
+    """并发批量 OCR：有界线程池上传识别，预处理与后处理交给常驻进程池，按页序回调结果
+
+    传入 AsyncImageOCRProcessor 时改为在一个事件循环中并发上传，并发数与速率由它限制。
+    """
+
+    def __init__(self, processor, ocr_options, max_workers=4, post_process=True, use_processes=True,
+                 async_processor=None):
+        self.processor = processor
+        self.async_processor = async_processor
+        self.ocr_options = ocr_options
+        self.max_workers = max(1, int(max_workers))
+        self.post_process = post_process
+        # 预处理、切字与缩略图编码是纯 CPU 运算，放到进程池中才能随核数扩展且不与界面争抢 GIL
+        self.use_processes = use_processes
+        self._process_pool = None
+        self._stop_event = threading.Event()
+        self.started_at = None
+        self.finished_pages = 0
+        self._results = []
+        self._next_index = 0
+
+    def cancel(self):
+        self._stop_event.set()
+
+    def pages_per_minute(self):
+        if not self.started_at or not self.finished_pages:
+            return 0.0
+        elapsed = time.perf_counter() - self.started_at
+        return self.finished_pages * 60.0 / elapsed if elapsed > 0 else 0.0
+
+    def _ocr_args(self):
+        opts = self.ocr_options
+        return (opts['image_size'], opts['char_ocr'], opts['det_mode'],
+                opts['return_position'], opts['return_choices'])
+
+    def _preprocess_in_pool(self):
+        return self._process_pool is not None and getattr(self.processor, 'preprocessor', None) is not None
+
+    def _preprocess_and_ocr(self, image_path):
+        """在进程池中预处理，再上传识别"""
+        from image_models.preprocess import preprocess_file
+
+        array, transform = self._process_pool.submit(
+            preprocess_file, self.processor.preprocessor, image_path).result()
+        return self.processor.process_preprocessed(array, transform, *self._ocr_args())
+
+    def _post_process(self, image_path, page_image, response):
+        if self._process_pool is not None:
+            # 子进程重新读取页面完成切字与缩略图编码，传回的页面改用本进程的句柄
+            page = self._process_pool.submit(post_process_page, image_path, response).result()
+            page.image = page_image
+            return page
+        return ImageProcessor(page_image, response).process_image()
+
+    def _process_page(self, index, image_path):
+        result = PageResult(index, image_path)
+        if self._stop_event.is_set():
+            result.error = '已取消'
+            return result
+
+        start = time.perf_counter()
+        # 上传与后处理共用同一句柄，文件只映射一次、图像只解码一次
+        page_image = result.page_image = PageImage(image_path)
+        try:
+            if self._preprocess_in_pool():
+                result.response = self._preprocess_and_ocr(image_path)
+            else:
+                result.response = self.processor.process_single_image(page_image, *self._ocr_args())
+            if result.response is None:
+                result.error = 'OCR处理失败'
+            elif self.post_process:
+                result.page = self._post_process(image_path, page_image, result.response)
+        except Exception as e:
+            result.error = str(e)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    async def _process_page_async(self, index, image_path):
+        """与 _process_page 相同，上传由 async_processor 在事件循环中完成，其余步骤放到线程中"""
+        result = PageResult(index, image_path)
+        if self._stop_event.is_set():
+            result.error = '已取消'
+            return result
+
+        start = time.perf_counter()
+        page_image = result.page_image = PageImage(image_path)
+        try:
+            if self._preprocess_in_pool():
+                result.response = await asyncio.to_thread(self._preprocess_and_ocr, image_path)
+            else:
+                result.response = await self.async_processor.process_page(page_image, *self._ocr_args())
+            if result.response is None:
+                result.error = 'OCR处理失败'
+            elif self.post_process:
+                result.page = await asyncio.to_thread(self._post_process, image_path, page_image, result.response)
+        except Exception as e:
+            result.error = str(e)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def run(self, source, on_page=None, on_progress=None):
+        """
+        执行批量识别
+
+        Args:
+            source: 目录路径或图像路径列表
+            on_page: 按页序回调 on_page(result)
+            on_progress: 每完成一页回调 on_progress(done, total, pages_per_minute)
+
+        Returns:
+            按页序排列的 PageResult 列表
+        """
+        paths = collect_image_paths(source)
+
+        self._stop_event.clear()
+        self.started_at = time.perf_counter()
+        self.finished_pages = 0
+        self._results = [None] * len(paths)
+        self._next_index = 0
+
+        needs_processes = self.post_process or getattr(self.processor, 'preprocessor', None) is not None
+        if self.use_processes and needs_processes and len(paths) > 1:
+            self._process_pool = shared_process_pool(self.max_workers)
+        try:
+            if self.async_processor is not None:
+                asyncio.run(self._run_pages_async(paths, on_page, on_progress))
+            else:
+                self._run_pages(paths, on_page, on_progress)
+        finally:
+            self._process_pool = None
+        return [result for result in self._results if result is not None]
+
+    def _collect(self, result, on_page, on_progress):
+        """记录完成的一页；只有前面的页都完成后才依次交付，保证页序"""
+        self._results[result.index] = result
+        self.finished_pages += 1
+        if on_progress:
+            on_progress(self.finished_pages, len(self._results), self.pages_per_minute())
+
+        while self._next_index < len(self._results) and self._results[self._next_index] is not None:
+            if on_page:
+                on_page(self._results[self._next_index])
+            self._next_index += 1
+
+    def _run_pages(self, paths, on_page, on_progress):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._process_page, i, path) for i, path in enumerate(paths)]
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                self._collect(future.result(), on_page, on_progress)
+
+                if self._stop_event.is_set():
+                    for pending in futures:
+                        pending.cancel()
+
+    async def _run_pages_async(self, paths, on_page, on_progress):
+        async with self.async_processor.running():
+            tasks = [asyncio.ensure_future(self._process_page_async(i, path)) for i, path in enumerate(paths)]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    self._collect(await next_done, on_page, on_progress)
+                    if self._stop_event.is_set():
+                        break
+            finally:
+                # 取消后尚未开始的页不再上传，等待已取消的任务结束再关闭会话
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
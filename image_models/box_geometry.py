@@ -0,0 +1,83 @@
+# image_models/box_geometry.py
+
+import numpy as np
+
+
+def scale_boxes(boxes, scale_width, scale_height):
+    """把 OCR 坐标（接口缩放后的图像）换算为原图像素，按 int() 语义向零取整"""
+    scale = np.array([scale_width, scale_height, scale_width, scale_height], dtype=np.float64)
+    return np.trunc(boxes / scale).astype(np.int32)
+
+
+def normalize_boxes(boxes):
+    """保证每个框为 (左, 上, 右, 下)"""
+    return np.concatenate([np.minimum(boxes[:, :2], boxes[:, 2:]),
+                           np.maximum(boxes[:, :2], boxes[:, 2:])], axis=1)
+
+
+def clamp_boxes(boxes, width, height):
+    """把框裁到图像范围内"""
+    limits = np.array([width, height, width, height])
+    return np.clip(boxes, 0, limits).astype(boxes.dtype, copy=False)
+
+
+def box_filter_mask(boxes, min_area=0, max_aspect=None):
+    """面积不小于 min_area、长宽比不超过 max_aspect 的框为 True"""
+    widths = boxes[:, 2] - boxes[:, 0]
+    heights = boxes[:, 3] - boxes[:, 1]
+    mask = widths * heights >= min_area
+    if max_aspect is not None:
+        short = np.minimum(widths, heights)
+        long = np.maximum(widths, heights)
+        mask &= long <= short * max_aspect
+    return mask
+
+
+class PageGeometry:
+    """一页 OCR 响应的框坐标，只解析一次为连续数组
+
+    line_quads: (N, 4, 2) 文本行四边形
+    word_boxes: (M, 4) 单字框 (x1, y1, x2, y2)
+    word_line:  (M,) 每个字所属的文本行下标
+    以上均为接口返回的坐标；换算到原图请用 line_rects() / word_rects()。
+    """
+
+    def __init__(self, ocr_data, image_size):
+        data = ocr_data['data']
+        lines = data['text_lines']
+        self.ocr_width = data['width']
+        self.ocr_height = data['height']
+        self.width, self.height = image_size
+        self.scale_width = self.ocr_width / self.width
+        self.scale_height = self.ocr_height / self.height
+
+        self.line_quads = np.array([line['position'] for line in lines], dtype=np.float64).reshape(-1, 4, 2)
+
+        words = [(index, word) for index, line in enumerate(lines) for word in line.get('words', [])]
+        self.word_boxes = np.array([word['position'] for _, word in words], dtype=np.float64).reshape(-1, 4)
+        self.word_line = np.fromiter((index for index, _ in words), dtype=np.int32, count=len(words))
+        self.word_texts = [word['text'] for _, word in words]
+        self.word_confidences = np.fromiter((word['confidence'] for _, word in words), dtype=np.float64,
+                                            count=len(words))
+
+    def __len__(self):
+        return len(self.word_texts)
+
+    @property
+    def scale(self):
+        return self.scale_width, self.scale_height
+
+    def line_rects(self, clamp=True):
+        """文本行外接矩形（原图像素），取四边形第 1、3 个顶点，与原先画框一致"""
+        corners = self.line_quads[:, [0, 2], :].reshape(-1, 4)
+        rects = normalize_boxes(scale_boxes(corners, self.scale_width, self.scale_height))
+        return clamp_boxes(rects, self.width, self.height) if clamp else rects
+
+    def word_rects(self, clamp=False):
+        """单字框（原图像素）"""
+        rects = normalize_boxes(scale_boxes(self.word_boxes, self.scale_width, self.scale_height))
+        return clamp_boxes(rects, self.width, self.height) if clamp else rects
+
+    def word_mask(self, min_area=0, max_aspect=None):
+        """按原图像素面积与长宽比筛选单字"""
+        return box_filter_mask(self.word_rects(clamp=True), min_area, max_aspect)
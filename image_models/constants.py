@@ -0,0 +1,7 @@
+# image_models/constants.py
+# 不依赖任何第三方库的常量，供启动阶段的模块（如 ConfigManager）轻量导入
+
+OCR_API_URL = 'https://images.kandianguji.com:14141/ocr_api'
+
+# 上传前预处理步骤，依次为纠斜、裁边、增强对比、二值化、去噪
+PREPROCESS_STEPS = ('deskew', 'crop_margins', 'contrast', 'binarize', 'despeckle')
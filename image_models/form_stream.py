@@ -0,0 +1,91 @@
+# image_models/form_stream.py
+
+import asyncio
+import base64
+from urllib.parse import quote, urlencode
+
+FORM_CONTENT_TYPE = 'application/x-www-form-urlencoded'
+CHUNK_SIZE = 48 * 1024  # 3 的倍数，分块编码的结果与整体编码完全一致
+
+
+def _quote_base64(encoded):
+    """base64 中只有 + / = 需要做表单转义"""
+    return encoded.replace(b'+', b'%2B').replace(b'/', b'%2F').replace(b'=', b'%3D')
+
+
+class Base64FormBody:
+    """流式生成 application/x-www-form-urlencoded 请求体
+
+    文件按块读取并增量 base64 编码，任何时刻内存中只有一个块，
+    不再同时持有原始字节、base64 bytes 与 str 三份副本。
+    len() 通过一次流式预扫描得到精确的 Content-Length。
+    """
+
+    def __init__(self, fields, fileobj, file_field='image', chunk_size=CHUNK_SIZE):
+        prefix = urlencode(fields) + '&' if fields else ''
+        self.prefix = (prefix + quote(file_field) + '=').encode('ascii')
+        self.fileobj = fileobj
+        self.chunk_size = max(3, chunk_size - chunk_size % 3)
+        self._start = fileobj.tell()
+        self._length = None
+        self.rewind()
+
+    def _raw_chunks(self):
+        self.fileobj.seek(self._start)
+        while True:
+            chunk = self.fileobj.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def iter_chunks(self):
+        """从头生成请求体的各个块"""
+        yield self.prefix
+        for chunk in self._raw_chunks():
+            yield _quote_base64(base64.b64encode(chunk))
+
+    def __len__(self):
+        if self._length is None:
+            length = len(self.prefix)
+            for chunk in self._raw_chunks():
+                encoded = base64.b64encode(chunk)
+                length += len(encoded) + 2 * (encoded.count(b'+') + encoded.count(b'/') + encoded.count(b'='))
+            self._length = length
+            self.rewind()
+        return self._length
+
+    def rewind(self):
+        """重试前回到请求体开头"""
+        self.fileobj.seek(self._start)
+        self._chunks = self.iter_chunks()
+        self._pending = b''
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._pending + b''.join(self._chunks)
+            self._pending = b''
+            return data
+
+        while len(self._pending) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._pending += chunk
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def __iter__(self):
+        while True:
+            data = self.read(self.chunk_size)
+            if not data:
+                break
+            yield data
+
+    async def aiter_chunks(self):
+        """供 aiohttp 使用的异步块迭代器，文件读取与编码放在线程池中"""
+        chunks = self.iter_chunks()
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
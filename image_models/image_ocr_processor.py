@@ -1,22 +1,134 @@
 # image_models/image_ocr_processor.py
 
-import base64
+import io
+import logging
 
 import requests
 
+from image_models.form_stream import FORM_CONTENT_TYPE, Base64FormBody
+from image_models.ocr_client import OCR_API_URL, OCRClient
+from image_models.ocr_cache import OCRResponseCache, file_digest
+from image_models.page_image import PageImage
+
+
+class OCRRequest:
+    """一次上传的准备结果：缓存键，以及命中的缓存响应或待发送的请求体"""
+
+    __slots__ = ('cache_key', 'cached', 'body')
+
+    def __init__(self, cache_key=None, cached=None, body=None):
+        self.cache_key = cache_key
+        self.cached = cached
+        self.body = body
+
 
 class ImageOCRProcessor:
-    def __init__(self, api_token, email, log_box):
+    def __init__(self, api_token, email, log_box, client=None, cache=None, preparer=None, api_url=None,
+                 tile_size=None, tile_overlap=256, preprocessor=None):
         self.api_token = api_token
         self.email = email
         self.log_box = log_box
+        # 客户端由应用持有并在各线程间共享；未传入时按 api_url（默认官方接口）单独创建一个
+        self.client = client if client is not None else OCRClient(url=api_url or OCR_API_URL)
+        # 传入 OCRResponseCache 时先查缓存，命中则不再上传
+        self.cache = cache
+        # 传入 UploadPreparer 时上传前先缩放、重新编码
+        self.preparer = preparer
+        # 设置 tile_size 后，长边超过它的页面分块识别再合并
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        # 传入 Preprocessor 时先纠斜、裁边等再上传，识别结果坐标映射回原图
+        self.preprocessor = preprocessor if preprocessor is not None and preprocessor.enabled() else None
+
+    def _tiler_for(self, size):
+        """长边超过 tile_size 时返回 TiledOCR，否则返回 None"""
+        if not self.tile_size or max(size) <= self.tile_size:
+            return None
+        from image_models.tiled_ocr import TiledOCR
+
+        self.log_box.log(f'图像较大，分块识别（块大小 {self.tile_size}）')
+        return TiledOCR(self, self.tile_size, self.tile_overlap)
+
+    def process_single_image(self, image, image_size, char_ocr, det_mode, return_position, return_choices):
+        """
+        Args:
+            image: 图像路径或 PageImage；同一页的上传、切图与显示共用一个 PageImage，文件只读一次、只解码一次
+        """
+        page_image = PageImage.of(image)
+        if self.preprocessor is not None:
+            array, transform = self.preprocessor.process(page_image.pil())
+            return self.process_preprocessed(array, transform, image_size, char_ocr, det_mode,
+                                             return_position, return_choices)
+
+        if self.tile_size:
+            tiler = self._tiler_for(page_image.size)
+            if tiler is not None:
+                return tiler.process(page_image.pil(), image_size, char_ocr, det_mode, return_position,
+                                     return_choices)
+
+        image_file = page_image.encoded()
+        try:
+            return self._process_file(image_file, image_size, char_ocr, det_mode, return_position,
+                                      return_choices, digest=page_image.digest() if self.cache is not None else None)
+        finally:
+            image_file.close()
+
+    def process_image_bytes(self, image_bytes, image_size, char_ocr, det_mode, return_position, return_choices):
+        """识别内存中已编码的图像（如分块、截图），不做分块"""
+        return self._process_file(io.BytesIO(image_bytes), image_size, char_ocr, det_mode,
+                                  return_position, return_choices)
 
-    def process_single_image(self, image_path, image_size, char_ocr, det_mode, return_position, return_choices):
-        with open(image_path, 'rb') as image_file:
-            base64_image = base64.b64encode(image_file.read()).decode('utf-8')
+    def process_preprocessed(self, array, transform, image_size, char_ocr, det_mode, return_position,
+                             return_choices):
+        """识别 Preprocessor 输出的灰度数组，结果坐标按 transform 映射回原图"""
+        from PIL import Image
+
+        image = Image.fromarray(array)
+        if not transform.is_identity():
+            self.log_box.log(f'预处理：纠斜 {transform.angle:.2f}°，识别区域 {image.width}×{image.height}')
+
+        tiler = self._tiler_for(image.size)
+        if tiler is not None:
+            response = tiler.process(image, image_size, char_ocr, det_mode, return_position, return_choices)
+        else:
+            buffer = io.BytesIO()
+            image.save(buffer, format='PNG', compress_level=1)
+            response = self.process_image_bytes(buffer.getvalue(), image_size, char_ocr, det_mode,
+                                                return_position, return_choices)
+        if response is None:
+            return None
+        return transform.apply_to_response(response)
+
+    def uses_local_steps(self, page_image):
+        """该页是否需要预处理或分块；这类页面由本类逐块上传，异步批量时放到线程中执行"""
+        return self.preprocessor is not None or bool(self.tile_size and max(page_image.size) > self.tile_size)
+
+    def prepare_request(self, image_file, image_size, char_ocr, det_mode, return_position, return_choices,
+                        digest=None):
+        """查缓存并构造请求体；同步与异步上传共用，命中缓存时 OCRRequest.cached 即为响应"""
+        cache_key = None
+        if self.cache is not None:
+            upload_params = self.preparer.cache_params() if self.preparer is not None else {}
+            if digest is None:
+                digest = file_digest(image_file)
+            # 键中包含接口地址，模拟服务器等其它接口的响应不会被当作正式结果取出
+            cache_key = OCRResponseCache.make_key(
+                digest, api_url=self.client.url, image_size=image_size,
+                char_ocr=char_ocr, det_mode=det_mode, return_position=return_position,
+                return_choices=return_choices, **upload_params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.log_box.log('命中OCR缓存', logging.DEBUG)
+                return OCRRequest(cache_key, cached=cached)
+            image_file.seek(0)
+
+        upload_file = image_file
+        if self.preparer is not None:
+            prepared = self.preparer.prepare(image_file, image_size)
+            if prepared is not None:
+                upload_file = io.BytesIO(prepared)
 
         data = {
-            'image': base64_image,
             'token': self.api_token,
             'email': self.email,
             'image_size': image_size,
@@ -25,11 +137,33 @@ class ImageOCRProcessor:
             'return_position': return_position,
             'return_choices': return_choices,
         }
+        # 请求体按块读取文件并增量编码，不在内存中保留整份 base64 副本
+        return OCRRequest(cache_key, body=Base64FormBody(data, upload_file, file_field='image'))
+
+    def store_response(self, request, result):
+        """把成功的响应写入缓存"""
+        if request.cache_key is not None and isinstance(result, dict) and 'data' in result:
+            self.cache.put(request.cache_key, result)
+
+    def _process_file(self, image_file, image_size, char_ocr, det_mode, return_position, return_choices,
+                      digest=None):
+        request = self.prepare_request(image_file, image_size, char_ocr, det_mode, return_position,
+                                       return_choices, digest)
+        if request.cached is not None:
+            return request.cached
+
+        try:
+            response = self.client.post(request.body, log=self.log_box.log,
+                                        headers={'Content-Type': FORM_CONTENT_TYPE})
+        except requests.RequestException as e:
+            self.log_box.log(f'请求失败：{e}', logging.ERROR)
+            return None
 
-        response = requests.post('https://images.kandianguji.com:14141/ocr_api', data=data)
         if response.status_code == 200:
-            return response.json()
+            result = response.json()
+            self.store_response(request, result)
+            return result
         else:
-            self.log_box.log(f'响应失败，状态码：{response.status_code}')
-            self.log_box.log(response.text)
+            self.log_box.log(f'响应失败，状态码：{response.status_code}', logging.ERROR)
+            self.log_box.log(response.text, logging.ERROR)
             return None
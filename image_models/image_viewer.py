@@ -1,63 +1,259 @@
 # image_models/image_viewer.py
 
-import io
+import math
+import sys
 
-from PIL import Image
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtWidgets import QLabel, QScrollArea, QVBoxLayout, QWidget, QSlider
+from PyQt5.QtCore import Qt, QRectF, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPen, QPixmap
+from PyQt5.QtWidgets import (QCheckBox, QGraphicsItem, QGraphicsPathItem, QGraphicsScene, QGraphicsView,
+                             QHBoxLayout, QSlider, QStyleOptionGraphicsItem, QVBoxLayout, QWidget)
+
+from image_models.page_image import PageImage
+from utils.qt_image_bridge import pil_to_pixmap
+
+# 文本行框颜色
+LINE_BOX_COLOR = QColor(0, 120, 215)
+# 单字框按置信度着色：(下限, 颜色)，从高到低匹配
+WORD_BOX_COLORS = (
+    (0.9, QColor(40, 170, 60)),
+    (0.7, QColor(230, 150, 0)),
+    (0.0, QColor(220, 30, 30)),
+)
+
+# 金字塔切块边长与最小层的长边
+TILE_SIZE = 512
+MIN_LEVEL_SIZE = 256
+# 停止缩放、拖动多久后重绘为平滑缩放（毫秒）
+SMOOTH_SETTLE_MS = 150
+
+
+class PyramidPixmapItem(QGraphicsItem):
+    """多分辨率页面图层：按当前缩放选用最接近的金字塔层，只绘制与可见区域相交的切块
+
+    第 i 层为原图的 1/2**i，首次用到时才由上一层缩小生成；交互过程中用快速缩放，停下后再平滑重绘。
+    """
+
+    def __init__(self, tile_size=TILE_SIZE):
+        super().__init__()
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.tile_size = tile_size
+        self.levels = []
+        self.max_level = 0
+        self.smooth = True
+        self._rect = QRectF()
+
+    def setPixmap(self, pixmap):
+        self.prepareGeometryChange()
+        self.levels = [pixmap]
+        self.max_level = max(0, int(math.log2(max(pixmap.width(), pixmap.height(), 1) / MIN_LEVEL_SIZE)))
+        self._rect = QRectF(pixmap.rect())
+        self.update()
+
+    def boundingRect(self):
+        return self._rect
+
+    def level_pixmap(self, level):
+        while len(self.levels) <= level:
+            previous = self.levels[-1]
+            self.levels.append(previous.scaled(max(1, previous.width() // 2), max(1, previous.height() // 2),
+                                               Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+        return self.levels[level]
+
+    def choose_level(self, level_of_detail):
+        if level_of_detail <= 0:
+            return self.max_level
+        return min(self.max_level, max(0, int(math.floor(math.log2(1 / level_of_detail)))))
+
+    def paint(self, painter, option, widget=None):
+        if not self.levels:
+            return
+        level_of_detail = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        level = self.choose_level(level_of_detail)
+        pixmap = self.level_pixmap(level)
+        # 该层一个像素对应原图的像素数（按实际宽度计算，兼容奇数边长）
+        factor_x = self._rect.width() / pixmap.width()
+        factor_y = self._rect.height() / pixmap.height()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, self.smooth)
+
+        exposed = option.exposedRect.intersected(self._rect)
+        tile = self.tile_size
+        first_col = int(exposed.left() / factor_x) // tile
+        last_col = int(math.ceil(exposed.right() / factor_x)) // tile
+        first_row = int(exposed.top() / factor_y) // tile
+        last_row = int(math.ceil(exposed.bottom() / factor_y)) // tile
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                source = QRectF(col * tile, row * tile, tile, tile).intersected(QRectF(pixmap.rect()))
+                if source.isEmpty():
+                    continue
+                target = QRectF(source.x() * factor_x, source.y() * factor_y,
+                                source.width() * factor_x, source.height() * factor_y)
+                painter.drawPixmap(target, pixmap, source)
+
+
+class PageGraphicsView(QGraphicsView):
+    """页面画布：点击时把场景坐标交给 ImageViewer 做命中检测，Ctrl+滚轮缩放"""
+
+    scene_clicked = pyqtSignal(float, float)
+    zoom_requested = pyqtSignal(int)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            point = self.mapToScene(event.pos())
+            self.scene_clicked.emit(point.x(), point.y())
+        super().mousePressEvent(event)
+
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier:
+            self.zoom_requested.emit(1 if event.angleDelta().y() > 0 else -1)
+            event.accept()
+            return
+        super().wheelEvent(event)
 
 
 class ImageViewer(QWidget):
+    # 点击到某个单字框时发出对应的 OCRWord
+    word_clicked = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
-        self.initUI()
         self.original_pixmap = None
+        self.page = None
+        self.overlay_items = []
+        self.initUI()
 
     def initUI(self):
         # 窗口布局和样式
         self.layout = QVBoxLayout(self)
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignCenter)
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setWidget(self.image_label)
-        self.layout.addWidget(self.scroll_area)
-
-        # 缩放滑动条
+        self.scene = QGraphicsScene(self)
+        self.view = PageGraphicsView(self.scene)
+        self.view.setAlignment(Qt.AlignCenter)
+        self.view.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.view.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.view.scene_clicked.connect(self.hitTest)
+        self.view.zoom_requested.connect(lambda step: self.zoomIn() if step > 0 else self.zoomOut())
+        self.layout.addWidget(self.view)
+        self.pixmap_item = PyramidPixmapItem()
+        self.scene.addItem(self.pixmap_item)
+
+        # 缩放、拖动时先用快速缩放，输入停止后再平滑重绘
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(SMOOTH_SETTLE_MS)
+        self._settle_timer.timeout.connect(self.finishInteraction)
+        self.view.horizontalScrollBar().valueChanged.connect(self.beginInteraction)
+        self.view.verticalScrollBar().valueChanged.connect(self.beginInteraction)
+
+        # 缩放滑动条与检测框开关
+        controls_layout = QHBoxLayout()
         self.slider = QSlider(Qt.Horizontal)
         self.slider.setRange(1, 200)
         self.slider.setValue(100)
         self.slider.valueChanged.connect(self.scaleImage)
-        self.layout.addWidget(self.slider)
+        controls_layout.addWidget(self.slider)
+        self.overlay_checkbox = QCheckBox('显示检测框')
+        self.overlay_checkbox.setChecked(True)
+        self.overlay_checkbox.toggled.connect(self.setOverlayVisible)
+        controls_layout.addWidget(self.overlay_checkbox)
+        self.layout.addLayout(controls_layout)
 
     def loadImage(self, image):
         if isinstance(image, str):
-            self.original_pixmap = QPixmap(image)
+            pixmap = QPixmap(image)
         elif isinstance(image, QPixmap):
-            self.original_pixmap = image
-        elif isinstance(image, Image.Image):
-            # 将PIL.Image.Image转换为QPixmap
-            byte_io = io.BytesIO()
-            image.save(byte_io, format='PNG')
-            byte_io.seek(0)
-            self.original_pixmap = QPixmap()
-            self.original_pixmap.loadFromData(byte_io.getvalue())
+            pixmap = image
+        elif isinstance(image, PageImage):
+            # 与识别、切图共用同一次解码
+            pixmap = QPixmap.fromImage(image.qimage())
+        elif 'PIL.Image' in sys.modules and isinstance(image, sys.modules['PIL.Image'].Image):
+            # 未导入过 PIL 时不可能收到 PIL 图像，这样启动时无需加载 PIL
+            # 直接包装像素缓冲区转换为QPixmap，不经过PNG编解码
+            pixmap = pil_to_pixmap(image)
         else:
             print("错误：无法识别的图像数据类型。")
             return
 
-        if self.original_pixmap.isNull():
+        if pixmap.isNull():
             print("错误：无法加载图像。")
             return
 
-        self.image_label.setPixmap(self.original_pixmap)
+        self.original_pixmap = pixmap
+        self.clearOverlay()
+        self.pixmap_item.setPixmap(pixmap)
+        self.scene.setSceneRect(QRectF(pixmap.rect()))
         self.resizeImage()
 
+    def setOverlay(self, page):
+        """在页面上叠加文本行框与单字框，坐标为原图像素，不修改页面图像"""
+        self.clearOverlay()
+        self.page = page
+        if page is None:
+            return
+
+        line_path = QPainterPath()
+        for x1, y1, x2, y2 in page.line_rects.tolist():
+            line_path.addRect(x1, y1, x2 - x1, y2 - y1)
+        self._addOverlayPath(line_path, LINE_BOX_COLOR, 2)
+
+        words = page.words
+        if words is not None and len(words):
+            remaining = words.confidences >= 0
+            for threshold, color in WORD_BOX_COLORS:
+                band = remaining & (words.confidences >= threshold)
+                remaining &= ~band
+                word_path = QPainterPath()
+                for x1, y1, x2, y2 in words.boxes[band].tolist():
+                    word_path.addRect(x1, y1, x2 - x1, y2 - y1)
+                self._addOverlayPath(word_path, color, 1)
+
+        self.setOverlayVisible(self.overlay_checkbox.isChecked())
+
+    def _addOverlayPath(self, path, color, width):
+        if path.isEmpty():
+            return
+        pen = QPen(color, width)
+        pen.setCosmetic(True)  # 线宽不随缩放变化
+        item = QGraphicsPathItem(path)
+        item.setPen(pen)
+        self.scene.addItem(item)
+        self.overlay_items.append(item)
+
+    def clearOverlay(self):
+        for item in self.overlay_items:
+            self.scene.removeItem(item)
+        self.overlay_items = []
+        self.page = None
+
+    def setOverlayVisible(self, visible):
+        for item in self.overlay_items:
+            item.setVisible(visible)
+
+    def hitTest(self, x, y):
+        """返回点击位置上的单字，多个框重叠时取面积最小的"""
+        if self.page is None or self.page.words is None or not len(self.page.words):
+            return None
+        boxes = self.page.words.boxes
+        inside = (boxes[:, 0] <= x) & (x <= boxes[:, 2]) & (boxes[:, 1] <= y) & (y <= boxes[:, 3])
+        hits = inside.nonzero()[0]
+        if not len(hits):
+            return None
+        areas = (boxes[hits, 2] - boxes[hits, 0]) * (boxes[hits, 3] - boxes[hits, 1])
+        word = self.page.words[int(hits[areas.argmin()])]
+        self.word_clicked.emit(word)
+        return word
+
+    def beginInteraction(self, *args):
+        self.pixmap_item.smooth = False
+        self._settle_timer.start()
+
+    def finishInteraction(self):
+        self.pixmap_item.smooth = True
+        self.pixmap_item.update()
+
     def resizeImage(self):
         if self.original_pixmap:
-            scaled_pixmap = self.original_pixmap.scaled(self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.image_label.setPixmap(scaled_pixmap)
+            self.beginInteraction()
+            self.view.fitInView(self.pixmap_item, Qt.KeepAspectRatio)
 
     def zoomIn(self):
         self.slider.setValue(self.slider.value() + 10)
@@ -68,9 +264,9 @@ class ImageViewer(QWidget):
     def scaleImage(self):
         if self.original_pixmap:
             scale_factor = self.slider.value() / 100.0
-            scaled_pixmap = self.original_pixmap.scaled(self.original_pixmap.size() * scale_factor, Qt.KeepAspectRatio,
-                                                        Qt.SmoothTransformation)
-            self.image_label.setPixmap(scaled_pixmap)
+            self.beginInteraction()
+            self.view.resetTransform()
+            self.view.scale(scale_factor, scale_factor)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -0,0 +1,111 @@
+# image_models/ocr_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join('cache', 'ocr_cache.sqlite3')
+# 无法直接取缓冲区时按块读取计算摘要
+DIGEST_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(image_file):
+    """文件对象内容的 sha256 十六进制摘要，计算后读取位置回到开头
+
+    内存缓冲（BytesIO、PageImage 的读取器）直接对缓冲区求摘要，不复制；其它文件按块读取。
+    """
+    if hasattr(image_file, 'getbuffer'):
+        digest = hashlib.sha256(image_file.getbuffer()).hexdigest()
+    else:
+        image_file.seek(0)
+        sha256 = hashlib.sha256()
+        for chunk in iter(lambda: image_file.read(DIGEST_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+        digest = sha256.hexdigest()
+    image_file.seek(0)
+    return digest
+
+
+class OCRResponseCache:
+    """以图像内容哈希 + 请求参数为键的 OCR 响应缓存（SQLite，按总大小做 LRU 淘汰）"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)')
+        self._conn.commit()
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(image_digest, **params):
+        """image_digest 为图像字节的 sha256 十六进制摘要；参数值统一转成字符串，避免 1024 与 '1024' 产生不同的键"""
+        normalized = json.dumps({name: str(value) for name, value in params.items()}, sort_keys=True)
+        return hashlib.sha256(f'{image_digest}|{normalized}'.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute('SELECT response FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, response):
+        payload = json.dumps(response, ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            if old is not None:
+                self._total_bytes -= old[0]
+            self._conn.execute('INSERT OR REPLACE INTO responses (key, response, size, last_access) VALUES (?, ?, ?, ?)',
+                               (key, payload, size, time.time()))
+            self._total_bytes += size
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """删除最久未访问的条目，直到总大小不超过上限"""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute('SELECT key, size FROM responses ORDER BY last_access LIMIT 64').fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def get_stats(self):
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'bytes': self._total_bytes}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,78 @@
+# image_models/ocr_client.py
+
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from image_models.constants import OCR_API_URL
+
+
+def backoff_delay(attempt, base, cap):
+    """第 attempt 次重试前的等待时间（指数退避 + 全抖动）"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class OCRClient:
+    """共享的 OCR HTTP 客户端：连接池复用、超时、带抖动的指数退避重试"""
+
+    def __init__(self, url=OCR_API_URL, pool_size=8, connect_timeout=5.0, read_timeout=60.0,
+                 max_retries=3, backoff_base=0.5, backoff_max=8.0):
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # 一个 Session 保持长连接，避免每页都重新做 TCP+TLS 握手
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'server_errors': 0, 'connection_errors': 0, 'failures': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+    def post(self, data, log=None, headers=None):
+        """发送表单请求，5xx 与连接错误按退避策略重试；最终失败时抛出最后一次的异常或返回最后的响应"""
+        attempt = 0
+        while True:
+            self._count('requests')
+            if hasattr(data, 'rewind'):
+                data.rewind()  # 流式请求体重试前需要回到开头
+            try:
+                response = self.session.post(self.url, data=data, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._count('connection_errors')
+                if attempt >= self.max_retries:
+                    self._count('failures')
+                    raise
+                reason = f'连接错误：{e}'
+            else:
+                if response.status_code < 500 or attempt >= self.max_retries:
+                    if response.status_code >= 500:
+                        self._count('server_errors')
+                        self._count('failures')
+                    return response
+                self._count('server_errors')
+                reason = f'服务器错误，状态码：{response.status_code}'
+
+            delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+            attempt += 1
+            self._count('retries')
+            if log:
+                log(f'{reason}，{delay:.1f} 秒后第 {attempt} 次重试')
+            time.sleep(delay)
+
+    def close(self):
+        self.session.close()
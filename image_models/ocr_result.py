@@ -0,0 +1,218 @@
+# image_models/ocr_result.py
+
+import io
+
+import numpy as np
+
+from image_models.box_geometry import PageGeometry
+from image_models.page_image import PageImage
+
+# 导出 Excel 时单字图片的最大尺寸
+EXPORT_THUMBNAIL_SIZE = (120, 80)
+
+
+def export_thumbnail(image, max_size=EXPORT_THUMBNAIL_SIZE):
+    """把单字切图转为可写入 Excel 的 RGB 图，超出 max_size 时等比缩小"""
+    from PIL import Image
+
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGB')
+    if image.size[0] > max_size[0] or image.size[1] > max_size[1]:
+        image = image.copy()
+        image.thumbnail(max_size, Image.Resampling.LANCZOS)
+    return image
+
+
+class PackedImages:
+    """一组小图的紧凑存储：各图的 PNG 字节依次拼接为一整块，按偏移取出
+
+    只含一个 bytes 与一个偏移数组，跨进程传递时序列化开销很小。
+    """
+
+    __slots__ = ('data', 'offsets')
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def encode(cls, images, max_size=EXPORT_THUMBNAIL_SIZE):
+        buffer = io.BytesIO()
+        offsets = [0]
+        for image in images:
+            export_thumbnail(image, max_size).save(buffer, format='PNG')
+            offsets.append(buffer.tell())
+        return cls(buffer.getvalue(), np.array(offsets, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.data[self.offsets[index]:self.offsets[index + 1]]
+
+    def subset(self, indices):
+        chunks = [self[i] for i in indices]
+        return PackedImages(b''.join(chunks), np.cumsum([0] + [len(chunk) for chunk in chunks], dtype=np.int64))
+
+
+class OCRWord:
+    """单字的轻量视图，只记录所在表与下标，切图在访问 image 时才生成"""
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def text(self):
+        return self.table.texts[self.index]
+
+    @property
+    def confidence(self):
+        return self.table.confidences[self.index].item()
+
+    @property
+    def box(self):
+        return tuple(self.table.boxes[self.index].tolist())
+
+    @property
+    def line(self):
+        return self.table.line_ids[self.index].item()
+
+    @property
+    def choices(self):
+        return self.table.choices[self.index] if self.table.choices is not None else ()
+
+    @property
+    def image(self):
+        return self.table.crop(self.index)
+
+    @property
+    def export_image(self):
+        return self.table.export_image(self.index)
+
+    def __repr__(self):
+        return f'OCRWord({self.text!r}, {self.confidence:.4f}, {self.box})'
+
+
+class OCRWordTable:
+    """一页所有单字的列式存储：文本、置信度、原图像素框、所属行与候选字
+
+    不保存切图，只保留所属页面的引用，需要时再从页面图像裁剪。
+    在进程池中后处理时还会带上预先编码好的缩略图 thumbnails（PackedImages）。
+    """
+
+    __slots__ = ('page', 'texts', 'confidences', 'boxes', 'line_ids', 'choices', 'thumbnails')
+
+    def __init__(self, page, texts, confidences, boxes, line_ids, choices=None, thumbnails=None):
+        self.page = page
+        self.texts = texts
+        self.confidences = confidences
+        self.boxes = boxes
+        self.line_ids = line_ids
+        self.choices = choices
+        self.thumbnails = thumbnails
+
+    @classmethod
+    def from_geometry(cls, page, geometry, response):
+        choices = None
+        words = [word for line in response['data']['text_lines'] for word in line.get('words', [])]
+        if any('choices' in word for word in words):
+            choices = [tuple((choice['text'], choice['confidence']) for choice in word.get('choices', ()))
+                       for word in words]
+        return cls(page, geometry.word_texts, geometry.word_confidences,
+                   geometry.word_rects(), geometry.word_line, choices)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return OCRWord(self, index)
+
+    def __iter__(self):
+        return (OCRWord(self, index) for index in range(len(self)))
+
+    def crop(self, index):
+        return self.page.source_image().crop(tuple(self.boxes[index].tolist()))
+
+    def encode_thumbnails(self, max_size=EXPORT_THUMBNAIL_SIZE):
+        """预先裁剪并编码全部单字缩略图，之后显示与导出都不必再解码整页"""
+        self.thumbnails = PackedImages.encode((self.crop(index) for index in range(len(self))), max_size)
+
+    def export_image(self, index):
+        """导出用的单字图：有预编码缩略图时返回其 PNG 字节，否则返回切图"""
+        if self.thumbnails is not None:
+            return self.thumbnails[index]
+        return self.crop(index)
+
+    def subset(self, indices):
+        """按下标取出若干字组成新表，仍引用同一页面"""
+        indices = np.asarray(indices, dtype=np.intp)
+        choices = [self.choices[i] for i in indices.tolist()] if self.choices is not None else None
+        thumbnails = self.thumbnails.subset(indices.tolist()) if self.thumbnails is not None else None
+        return OCRWordTable(self.page, [self.texts[i] for i in indices.tolist()], self.confidences[indices],
+                            self.boxes[indices], self.line_ids[indices], choices, thumbnails)
+
+    def rows(self):
+        """逐行生成 (切图或其 PNG 字节, 文字, 置信度)，供 Excel 导出使用"""
+        confidences = self.confidences.tolist()
+        for index, text in enumerate(self.texts):
+            yield self.export_image(index), text, confidences[index]
+
+
+class OCRPage:
+    """一页识别结果：页面来源、文本行与单字表"""
+
+    __slots__ = ('image_path', 'image', 'width', 'height', 'texts', 'line_rects', 'words')
+
+    def __init__(self, image_path=None, image=None):
+        self.image_path = image_path
+        self.image = image
+        self.width = self.height = 0
+        self.texts = []
+        self.line_rects = np.empty((0, 4), dtype=np.int32)
+        self.words = None
+
+    @classmethod
+    def from_response(cls, response, image_path=None, image=None, geometry=None):
+        """
+        Args:
+            response: 接口返回的字典
+            image_path: 页面图像路径，未传 image 时在首次切图时才打开
+            image: 已打开的页面图像或 PageImage 句柄
+            geometry: 已解析的 PageGeometry，避免重复解析
+        """
+        if isinstance(image, PageImage) and image_path is None:
+            image_path = image.path
+        page = cls(image_path, image)
+        if geometry is None:
+            if image is None:
+                page.image = image = PageImage(image_path)
+            geometry = PageGeometry(response, image.size)
+        page.width, page.height = geometry.width, geometry.height
+        page.texts = list(response['data']['texts'])
+        page.line_rects = geometry.line_rects()
+        page.words = OCRWordTable.from_geometry(page, geometry, response)
+        return page
+
+    def source_image(self):
+        if self.image is None:
+            self.image = PageImage(self.image_path)
+        if isinstance(self.image, PageImage):
+            return self.image.pil()
+        return self.image
+
+    def release_image(self):
+        """释放页面图像，之后切图会重新从文件读取"""
+        if isinstance(self.image, PageImage):
+            self.image.release()
+        elif self.image_path is not None:
+            self.image = None
+
+    def __len__(self):
+        return len(self.words) if self.words is not None else 0
@@ -0,0 +1,210 @@
+# image_models/page_image.py
+
+import hashlib
+import io
+import mmap
+import threading
+from collections import OrderedDict
+
+# 同时保留解码像素与文件映射的页数，超出后释放最久未用的页，需要时再重新映射、解码
+MAX_OPEN_PAGES = 4
+
+_open_pages = OrderedDict()
+_open_lock = threading.Lock()
+
+
+def _touch(page):
+    """登记最近使用的页，超出上限时释放最早的页"""
+    with _open_lock:
+        _open_pages[id(page)] = page
+        _open_pages.move_to_end(id(page))
+        evicted = []
+        while len(_open_pages) > MAX_OPEN_PAGES:
+            evicted.append(_open_pages.popitem(last=False)[1])
+    for old in evicted:
+        # 正被其它线程使用的页跳过释放，避免两页相互淘汰时交叉持锁；下次淘汰时再释放
+        if old._lock.acquire(blocking=False):
+            try:
+                old.release()
+            finally:
+                old._lock.release()
+
+
+class BufferReader(io.BufferedIOBase):
+    """在共享缓冲区上的独立读取位置，可交给 PIL、hashlib 与上传请求体使用而不复制数据"""
+
+    def __init__(self, buffer, on_close=None):
+        super().__init__()
+        self._view = memoryview(buffer)
+        self._pos = 0
+        # 关闭时通知所属页，页据此决定何时真正关闭映射
+        self._on_close = on_close
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def getbuffer(self):
+        return self._view
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._pos + size)
+        data = self._view[self._pos:end].tobytes()
+        self._pos = max(self._pos, end)
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        self._view.release()
+        super().close()
+        if self._on_close is not None:
+            self._on_close()
+
+
+class PageImage:
+    """一页图像的共享句柄：文件只读一次（尽量内存映射）、只解码一次
+
+    上传取 encoded()，切图与预处理取 pil()，界面显示取 qimage()，三者共用同一份数据。
+    """
+
+    def __init__(self, path=None, data=None, image=None):
+        """
+        Args:
+            path: 图像文件路径
+            data: 已编码的图像字节（如内存中的截图），没有 path 时使用
+            image: 已解码的 PIL 图像；与 data 同时传入时，上传用 data，切图与显示用 image
+        """
+        self.path = path
+        self._data = data
+        self._mapped = False
+        self._image = image
+        # 外部传入的像素无处重新加载，释放时保留
+        self._keep_image = image is not None
+        self._size = image.size if image is not None else None
+        self._digest = None
+        # 尚未关闭的 encoded() 读取者数；有读取者时 release() 推迟关闭映射，由最后一个读取者关闭
+        self._readers = 0
+        self._release_pending = False
+        self._lock = threading.RLock()
+
+    def __reduce__(self):
+        # 跨进程传递时只传路径，映射与解码结果在对方进程按需重建
+        if self.path is not None:
+            return PageImage, (self.path,)
+        return PageImage, (None, bytes(self._buffer()), self._image if self._keep_image else None)
+
+    @classmethod
+    def of(cls, source):
+        """路径或已有句柄统一为 PageImage"""
+        return source if isinstance(source, cls) else cls(path=source)
+
+    def _buffer(self):
+        with self._lock:
+            if self._data is None:
+                with open(self.path, 'rb') as file:
+                    try:
+                        self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                        self._mapped = True
+                    except (ValueError, OSError):
+                        # 空文件或不支持映射时退回一次性读取
+                        self._data = file.read()
+            _touch(self)
+            return self._data
+
+    def encoded(self):
+        """已编码的文件内容，每次返回独立的读取位置；用完须 close()"""
+        with self._lock:
+            # 在锁内创建并登记，其它线程的 release() 不会在两步之间关闭映射
+            reader = BufferReader(self._buffer(), self._reader_closed)
+            self._readers += 1
+            return reader
+
+    def _reader_closed(self):
+        with self._lock:
+            self._readers -= 1
+            if self._readers == 0 and self._release_pending:
+                self._close_mapping()
+
+    def digest(self):
+        with self._lock:
+            if self._digest is None:
+                self._digest = hashlib.sha256(self._buffer()).hexdigest()
+            return self._digest
+
+    @property
+    def size(self):
+        """只读文件头得到宽高，不解码像素"""
+        with self._lock:
+            if self._size is None:
+                if self._image is not None:
+                    self._size = self._image.size
+                else:
+                    from PIL import Image
+                    with self.encoded() as reader, Image.open(reader) as image:
+                        self._size = image.size
+            return self._size
+
+    def pil(self):
+        """解码后的 PIL 图像，同一页只解码一次"""
+        with self._lock:
+            if self._image is None:
+                from PIL import Image
+                # 解码完成后即关闭读取者，不再引用映射，释放时可直接关闭
+                with self.encoded() as reader:
+                    image = Image.open(reader)
+                    image.load()
+                self._image = image
+                self._size = image.size
+            _touch(self)
+            return self._image
+
+    def qimage(self):
+        """由 pil() 的解码结果直接包装出 QImage，仅在界面中调用；不缓存，转成 QPixmap 后即可释放"""
+        from utils.qt_image_bridge import pil_to_qimage
+
+        return pil_to_qimage(self.pil())
+
+    def release(self):
+        """释放解码像素与文件映射，之后访问时重新映射、解码"""
+        with self._lock:
+            if not self._keep_image:
+                self._image = None
+            if self._readers:
+                # 上传等仍在读取映射，等最后一个读取者关闭后再关闭
+                self._release_pending = self._mapped
+            else:
+                self._close_mapping()
+
+    def _close_mapping(self):
+        self._release_pending = False
+        if self._mapped:
+            try:
+                self._data.close()
+            except BufferError:
+                pass  # 仍有读取者之外的引用，由其释放后回收
+            self._data = None
+            self._mapped = False
+
+    def close(self):
+        with _open_lock:
+            _open_pages.pop(id(self), None)
+        self.release()
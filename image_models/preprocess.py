@@ -0,0 +1,247 @@
+# image_models/preprocess.py
+"""
+上传前的页面预处理：纠斜、裁边、对比度拉伸、自适应二值化、去噪点
+
+除旋转外均为整幅数组运算；每一步都记录在 PageTransform 中，
+识别结果的坐标可由 PageTransform.apply_to_response 映射回原图。
+本模块不依赖 PyQt，可在进程池中运行。
+"""
+
+import math
+
+import numpy as np
+from PIL import Image
+
+from image_models.constants import PREPROCESS_STEPS
+
+
+def otsu_threshold(gray):
+    """Otsu 全局阈值，低于阈值视为墨迹"""
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight = np.cumsum(hist)
+    total = weight[-1]
+    mean = np.cumsum(hist * levels)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = (mean[-1] * weight / total - mean) ** 2 / (weight * (total - weight))
+    return int(np.nanargmax(between))
+
+
+def estimate_skew(gray, max_angle=5.0, step=0.1, max_side=1200, max_points=100000):
+    """投影法估计倾斜角（度，逆时针为正）：转正后行或列的投影越尖锐，得分越高
+
+    先以 5 倍步长粗搜，再在最优角附近按 step 细搜。
+    """
+    factor = max(1, max(gray.shape) // max_side)
+    small = gray[::factor, ::factor]
+    ys, xs = np.nonzero(small <= otsu_threshold(small))
+    if len(ys) < 100:
+        return 0.0
+    if len(ys) > max_points:
+        pick = np.random.default_rng(0).choice(len(ys), max_points, replace=False)
+        ys, xs = ys[pick], xs[pick]
+    ys = ys - small.shape[0] // 2
+    xs = xs - small.shape[1] // 2
+
+    def scores(angles, axis):
+        radians = np.deg2rad(angles)[:, None]
+        sin, cos = np.sin(radians), np.cos(radians)
+        coords = xs * sin + ys * cos if axis == 'rows' else xs * cos - ys * sin
+        return _projection_sharpness(np.rint(coords).astype(np.int64))
+
+    # 粗搜时判断排版方向：横排的行投影、竖排的列投影随角度变化更剧烈
+    coarse_angles = np.arange(-max_angle, max_angle + step, step * 5)
+    coarse = {axis: scores(coarse_angles, axis) for axis in ('rows', 'cols')}
+    axis = max(coarse, key=lambda name: coarse[name].max() / coarse[name].mean())
+    best = float(coarse_angles[int(coarse[axis].argmax())])
+
+    fine_angles = np.arange(best - step * 5, best + step * 5.5, step)
+    best = float(fine_angles[int(scores(fine_angles, axis).argmax())])
+    return round(max(-max_angle, min(max_angle, best)), 2) + 0.0
+
+
+def _projection_sharpness(coords):
+    """每个候选角度下投影直方图的平方和"""
+    offset = coords - coords.min(axis=1, keepdims=True)
+    width = int(offset.max()) + 1
+    flat = offset + np.arange(len(coords))[:, None] * width
+    counts = np.bincount(flat.ravel(), minlength=len(coords) * width).reshape(len(coords), width)
+    return (counts.astype(np.float64) ** 2).sum(axis=1)
+
+
+def margin_box(gray, pad_ratio=0.01, noise_ratio=0.002):
+    """墨迹所在区域外扩少许后的裁剪框 (左, 上, 右, 下)；没有墨迹时返回整幅"""
+    height, width = gray.shape
+    ink = gray <= otsu_threshold(gray)
+    rows = np.flatnonzero(ink.sum(axis=1) > max(2, width * noise_ratio))
+    cols = np.flatnonzero(ink.sum(axis=0) > max(2, height * noise_ratio))
+    if not len(rows) or not len(cols):
+        return 0, 0, width, height
+    pad = int(max(height, width) * pad_ratio)
+    return (max(0, int(cols[0]) - pad), max(0, int(rows[0]) - pad),
+            min(width, int(cols[-1]) + 1 + pad), min(height, int(rows[-1]) + 1 + pad))
+
+
+def stretch_contrast(gray, low=1.0, high=99.0):
+    """按直方图百分位拉伸对比度，泛黄纸张拉回白底"""
+    cumulative = np.cumsum(np.bincount(gray.ravel(), minlength=256))
+    total = cumulative[-1]
+    lo = int(np.searchsorted(cumulative, total * low / 100))
+    hi = int(np.searchsorted(cumulative, total * high / 100))
+    if hi <= lo:
+        return gray
+    lut = np.clip((np.arange(256) - lo) * 255.0 / (hi - lo), 0, 255).astype(np.uint8)
+    return lut[gray]
+
+
+def adaptive_binarize(gray, window=None, sensitivity=0.15):
+    """Bradley 自适应阈值：像素比邻域均值暗 sensitivity 以上视为墨迹，邻域均值由积分图求得"""
+    height, width = gray.shape
+    if window is None:
+        window = max(15, (min(height, width) // 40) | 1)
+    half = window // 2
+    integral = np.zeros((height + 1, width + 1), dtype=np.int64)
+    np.cumsum(np.cumsum(gray, axis=0, dtype=np.int64), axis=1, out=integral[1:, 1:])
+
+    y1 = np.clip(np.arange(height) - half, 0, height)
+    y2 = np.clip(np.arange(height) + half + 1, 0, height)
+    x1 = np.clip(np.arange(width) - half, 0, width)
+    x2 = np.clip(np.arange(width) + half + 1, 0, width)
+    sums = (integral[np.ix_(y2, x2)] - integral[np.ix_(y1, x2)]
+            - integral[np.ix_(y2, x1)] + integral[np.ix_(y1, x1)])
+    area = (y2 - y1)[:, None] * (x2 - x1)[None, :]
+    ink = gray.astype(np.int64) * area <= sums * (1.0 - sensitivity)
+    return np.where(ink, 0, 255).astype(np.uint8)
+
+
+def despeckle(gray):
+    """3×3 中值滤波，去掉孤立噪点"""
+    padded = np.pad(gray, 1, mode='edge')
+    height, width = gray.shape
+    stack = np.stack([padded[dy:dy + height, dx:dx + width] for dy in range(3) for dx in range(3)])
+    return np.partition(stack, 4, axis=0)[4]
+
+
+class PageTransform:
+    """预处理后图像坐标 -> 原图坐标的仿射变换（3×3 齐次矩阵）"""
+
+    def __init__(self, original_size):
+        self.original_size = original_size
+        self.size = original_size
+        self.matrix = np.eye(3)
+        self.angle = 0.0
+        self.crop_box = None
+
+    def is_identity(self):
+        return self.size == self.original_size and np.allclose(self.matrix, np.eye(3))
+
+    def rotated(self, angle, old_size, new_size):
+        """记录绕中心逆时针旋转 angle 度（画布扩展为 new_size）"""
+        theta = math.radians(angle)
+        cos, sin = math.cos(theta), math.sin(theta)
+        # 新图坐标 -> 旧图坐标：先移到新中心，反向旋转，再移回旧中心
+        to_center = np.array([[1, 0, -new_size[0] / 2], [0, 1, -new_size[1] / 2], [0, 0, 1]])
+        inverse = np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]])
+        from_center = np.array([[1, 0, old_size[0] / 2], [0, 1, old_size[1] / 2], [0, 0, 1]])
+        self.matrix = self.matrix @ from_center @ inverse @ to_center
+        self.angle += angle
+        self.size = new_size
+
+    def cropped(self, box):
+        """记录裁剪 (左, 上, 右, 下)"""
+        self.matrix = self.matrix @ np.array([[1, 0, box[0]], [0, 1, box[1]], [0, 0, 1]])
+        self.crop_box = box
+        self.size = (box[2] - box[0], box[3] - box[1])
+
+    def map_points(self, points):
+        points = np.asarray(points, dtype=np.float64)
+        return points @ self.matrix[:2, :2].T + self.matrix[:2, 2]
+
+    def apply_to_response(self, response):
+        """把预处理后图像上的识别结果映射回原图，data.width/height 改为原图尺寸"""
+        data = response['data']
+        scale = np.array([self.size[0] / data['width'], self.size[1] / data['height']])
+        width, height = self.original_size
+        limits = np.array([width, height])
+
+        lines = data['text_lines']
+        quads = np.array([line['position'] for line in lines], dtype=np.float64).reshape(-1, 4, 2)
+        quads = np.clip(np.rint(self.map_points(quads * scale)), 0, limits).astype(int).tolist()
+
+        words = [word for line in lines for word in line.get('words', [])]
+        boxes = np.array([word['position'] for word in words], dtype=np.float64).reshape(-1, 2, 2) * scale
+        # 单字框旋转后取四角的外接矩形
+        corners = np.stack([boxes[:, 0], np.stack([boxes[:, 1, 0], boxes[:, 0, 1]], axis=1),
+                            boxes[:, 1], np.stack([boxes[:, 0, 0], boxes[:, 1, 1]], axis=1)], axis=1)
+        mapped = self.map_points(corners)
+        boxes = np.concatenate([mapped.min(axis=1), mapped.max(axis=1)], axis=1)
+        boxes = np.clip(np.rint(boxes), 0, np.tile(limits, 2)).astype(int).tolist()
+
+        word_index = 0
+        text_lines = []
+        for line, quad in zip(lines, quads):
+            mapped_words = []
+            for word in line.get('words', []):
+                mapped_words.append(dict(word, position=boxes[word_index]))
+                word_index += 1
+            text_lines.append(dict(line, position=quad, words=mapped_words))
+        mapped_data = dict(data, width=width, height=height, text_lines=text_lines)
+        return dict(response, data=mapped_data)
+
+
+class Preprocessor:
+    """按开关依次执行各预处理步骤，返回灰度数组与坐标变换"""
+
+    def __init__(self, deskew=False, crop_margins=False, contrast=False, binarize=False, despeckle=False,
+                 max_skew=5.0):
+        self.deskew = deskew
+        self.crop_margins = crop_margins
+        self.contrast = contrast
+        self.binarize = binarize
+        self.despeckle = despeckle
+        self.max_skew = max_skew
+
+    def enabled(self):
+        return any(getattr(self, step) for step in PREPROCESS_STEPS)
+
+    def process(self, image):
+        """
+        Args:
+            image: PIL 图像
+        Returns:
+            (uint8 灰度数组, PageTransform)
+        """
+        transform = PageTransform(image.size)
+        gray_image = image.convert('L')
+
+        if self.deskew:
+            angle = estimate_skew(np.asarray(gray_image), self.max_skew)
+            if abs(angle) >= 0.1:
+                old_size = gray_image.size
+                gray_image = gray_image.rotate(-angle, resample=Image.Resampling.BICUBIC, expand=True,
+                                               fillcolor=255)
+                transform.rotated(-angle, old_size, gray_image.size)
+
+        gray = np.asarray(gray_image)
+        if self.crop_margins:
+            box = margin_box(gray)
+            if box != (0, 0, gray.shape[1], gray.shape[0]):
+                gray = gray[box[1]:box[3], box[0]:box[2]]
+                transform.cropped(box)
+
+        if self.contrast:
+            gray = stretch_contrast(gray)
+        if self.binarize:
+            gray = adaptive_binarize(gray)
+        if self.despeckle:
+            gray = despeckle(gray)
+        return np.ascontiguousarray(gray), transform
+
+    def process_file(self, image_path):
+        with Image.open(image_path) as image:
+            return self.process(image)
+
+
+def preprocess_file(preprocessor, image_path):
+    """进程池入口：返回的数组与变换均可直接序列化传回"""
+    return preprocessor.process_file(image_path)
@@ -0,0 +1,46 @@
+# image_models/process_pool.py
+"""
+批量识别共用的常驻进程池
+
+预处理、切字与缩略图编码都是纯 CPU 运算，放在线程里会与界面和其它页争抢 GIL；
+进程池在首次使用时创建并跨多次批量识别复用，省去每批重新启动子进程的开销。
+子进程以 spawn 方式启动：批量识别时其它上传线程可能正持有页面句柄或缓存的锁，
+fork 出的子进程会继承这些已加锁的锁而卡死。
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def shared_process_pool(max_workers=None):
+    """返回常驻进程池，进程数不超过 CPU 核数；需要更多进程时重建"""
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(max_workers or cpu_count, cpu_count))
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            if _pool is not None:
+                # 旧池中已提交的任务照常完成
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_process_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+            _pool_workers = 0
+
+
+atexit.register(shutdown_process_pool)
@@ -0,0 +1,191 @@
+# image_models/tiled_ocr.py
+
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+
+def _axis_spans(length, tile_size, overlap):
+    """沿一个方向切块，返回 [(起点, 终点, 负责区起点, 负责区终点)]
+
+    最后一块贴齐边缘，因此与前一块的重叠可能大于 overlap；
+    负责区以相邻两块实际重叠带的中线为界，恰好拼满整个方向。
+    """
+    if length <= tile_size:
+        return [(0, length, 0, length)]
+    stride = tile_size - overlap
+    starts = list(range(0, length - tile_size, stride)) + [length - tile_size]
+    ends = [start + tile_size for start in starts]
+    cuts = [0] + [(starts[i + 1] + ends[i]) / 2 for i in range(len(starts) - 1)] + [length]
+    return [(starts[i], ends[i], cuts[i], cuts[i + 1]) for i in range(len(starts))]
+
+
+def _iou(a, b):
+    ix = min(a[2], b[2]) - max(a[0], b[0])
+    iy = min(a[3], b[3]) - max(a[1], b[1])
+    if ix <= 0 or iy <= 0:
+        return 0.0
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+class TiledOCR:
+    """超大页面分块识别：切成带重叠的小块并发识别，坐标映射回整页后合并去重
+
+    合并结果与普通响应结构相同，data.width/height 为原图尺寸，
+    PageGeometry 与 ImageProcessor 无需任何改动即可使用。
+    """
+
+    def __init__(self, processor, tile_size=2048, overlap=256, max_workers=4):
+        self.processor = processor
+        self.tile_size = int(tile_size)
+        self.overlap = min(int(overlap), self.tile_size // 2)
+        self.max_workers = max_workers
+
+    def needs_tiling(self, size):
+        return max(size) > self.tile_size
+
+    def tile_layout(self, width, height):
+        """返回 [(切块框, 负责区域)]，每块只保留中心落在自己负责区域内的字"""
+        return [((x[0], y[0], x[1], y[1]), (x[2], y[2], x[3], y[3]))
+                for y in _axis_spans(height, self.tile_size, self.overlap)
+                for x in _axis_spans(width, self.tile_size, self.overlap)]
+
+    def _ocr_tile(self, image, box, image_size, char_ocr, det_mode, return_position, return_choices):
+        buffer = io.BytesIO()
+        image.crop(box).save(buffer, format='PNG', compress_level=1)
+        return self.processor.process_image_bytes(buffer.getvalue(), image_size, char_ocr, det_mode,
+                                                  return_position, return_choices)
+
+    def process(self, image, image_size, char_ocr, det_mode, return_position, return_choices):
+        """image 为图像路径或已打开的 PIL 图像"""
+        if isinstance(image, (str, os.PathLike)):
+            with Image.open(image) as opened:
+                opened.load()
+                return self.process(opened, image_size, char_ocr, det_mode, return_position, return_choices)
+
+        width, height = image.size
+        layout = self.tile_layout(width, height)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            responses = list(executor.map(
+                lambda tile: self._ocr_tile(image, tile[0], image_size, char_ocr, det_mode,
+                                            return_position, return_choices), layout))
+
+        if any(response is None for response in responses):
+            return None
+        return self.merge(responses, layout, width, height, det_mode)
+
+    def merge(self, responses, layout, width, height, det_mode):
+        """把各块结果映射到整页坐标，按负责区域取舍并去掉重叠带中重复识别的字"""
+        kept_lines = []
+        for response, (box, owned) in zip(responses, layout):
+            data = response['data']
+            scale_x = (box[2] - box[0]) / data['width']
+            scale_y = (box[3] - box[1]) / data['height']
+
+            def owns(x, y):
+                return owned[0] <= x < owned[2] and owned[1] <= y < owned[3]
+
+            for line in data['text_lines']:
+                quad = [[round(x * scale_x + box[0]), round(y * scale_y + box[1])] for x, y in line['position']]
+                words = []
+                for word in line.get('words', []):
+                    x1, y1, x2, y2 = word['position']
+                    position = [round(x1 * scale_x + box[0]), round(y1 * scale_y + box[1]),
+                                round(x2 * scale_x + box[0]), round(y2 * scale_y + box[1])]
+                    if owns((position[0] + position[2]) / 2, (position[1] + position[3]) / 2):
+                        words.append(dict(word, position=position))
+
+                if line.get('words'):
+                    if not words:
+                        continue
+                    if len(words) != len(line['words']):
+                        # 行被切开时按保留下来的字重新计算外框与文本
+                        x1 = min(word['position'][0] for word in words)
+                        y1 = min(word['position'][1] for word in words)
+                        x2 = max(word['position'][2] for word in words)
+                        y2 = max(word['position'][3] for word in words)
+                        quad = [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+                    text = ''.join(word['text'] for word in words)
+                else:
+                    center_x = sum(x for x, _ in quad) / 4
+                    center_y = sum(y for _, y in quad) / 4
+                    if not owns(center_x, center_y):
+                        continue
+                    text = line['text']
+                kept_lines.append(dict(line, position=quad, words=words, text=text))
+
+        kept_lines = self._sort_lines(self._remove_duplicates(kept_lines, layout), det_mode != 'hp')
+        return {'data': {'width': width, 'height': height, 'text_lines': kept_lines,
+                         'texts': [line['text'] for line in kept_lines]}}
+
+    def _remove_duplicates(self, lines, layout):
+        """中线附近坐标略有偏差的同一个字可能被两块都保留，按 IoU 去重并保留置信度高的"""
+        band = self.overlap / 2
+        cuts_x = {owned[0] for _, owned in layout if owned[0] > 0}
+        cuts_y = {owned[1] for _, owned in layout if owned[1] > 0}
+
+        def near_cut(position):
+            cx, cy = (position[0] + position[2]) / 2, (position[1] + position[3]) / 2
+            return (any(abs(cx - cut) <= band for cut in cuts_x) or
+                    any(abs(cy - cut) <= band for cut in cuts_y))
+
+        candidates = [(line, word) for line in lines for word in line['words'] if near_cut(word['position'])]
+        removed = set()
+        for i, (line_a, word_a) in enumerate(candidates):
+            if id(word_a) in removed:
+                continue
+            for line_b, word_b in candidates[i + 1:]:
+                if line_a is line_b or id(word_b) in removed:
+                    continue
+                if _iou(word_a['position'], word_b['position']) > 0.5:
+                    loser = word_b if word_a['confidence'] >= word_b['confidence'] else word_a
+                    removed.add(id(loser))
+                    if loser is word_a:
+                        break
+
+        if not removed:
+            return lines
+        result = []
+        for line in lines:
+            if line['words']:
+                words = [word for word in line['words'] if id(word) not in removed]
+                if not words:
+                    continue
+                line = dict(line, words=words, text=''.join(word['text'] for word in words))
+            result.append(line)
+        return result
+
+    @staticmethod
+    def _sort_lines(lines, vertical):
+        """恢复阅读顺序：竖排从右往左分列、列内从上到下；横排从上往下分行、行内从左到右
+
+        被切块拆开的同一列（行）在垂直于阅读方向上大幅重叠，先按此归为一组再组内排序。
+        """
+        def extent(line):
+            xs = [x for x, _ in line['position']]
+            ys = [y for _, y in line['position']]
+            if vertical:
+                return (min(xs), max(xs)), min(ys)
+            return (min(ys), max(ys)), min(xs)
+
+        items = sorted(((extent(line), line) for line in lines),
+                       key=lambda item: -(item[0][0][0] + item[0][0][1]) if vertical
+                       else item[0][0][0] + item[0][0][1])
+        groups = []
+        for (span, along), line in items:
+            if groups:
+                group_span, members = groups[-1]
+                overlap = min(span[1], group_span[1]) - max(span[0], group_span[0])
+                if overlap > 0.5 * min(span[1] - span[0], group_span[1] - group_span[0]):
+                    members.append((along, line))
+                    continue
+            groups.append((span, [(along, line)]))
+
+        ordered = []
+        for _, members in groups:
+            ordered.extend(line for _, line in sorted(members, key=lambda member: member[0]))
+        return ordered
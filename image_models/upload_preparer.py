@@ -0,0 +1,72 @@
+# image_models/upload_preparer.py
+
+import io
+
+from PIL import Image
+
+UPLOAD_FORMATS = ('original', 'JPEG', 'WEBP', 'PNG')
+
+
+class UploadPreparer:
+    """上传前将图像缩小到 image_size 并重新编码，减少上传字节数
+
+    只做等比缩放，接口返回的 data.width/height 与原图宽高比一致，
+    PageGeometry 仍能把坐标换算回原图。
+    """
+
+    def __init__(self, fmt='JPEG', quality=85, grayscale=True):
+        if fmt not in UPLOAD_FORMATS:
+            raise ValueError(f'不支持的上传格式: {fmt}')
+        self.fmt = fmt
+        self.quality = int(quality)
+        self.grayscale = bool(grayscale)
+
+    def cache_params(self):
+        """影响识别结果的上传参数，参与缓存键计算"""
+        return {'upload_format': self.fmt, 'upload_quality': self.quality, 'upload_grayscale': self.grayscale}
+
+    def prepare(self, source, image_size):
+        """
+        返回待上传的图像字节
+
+        Args:
+            source: 图像字节或已打开的二进制文件对象
+            image_size: 目标长边尺寸
+        Returns:
+            重新编码后的字节；format 为 original 或重新编码后反而更大时返回 None，表示直接上传原图
+        """
+        if self.fmt == 'original':
+            return None
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        start = source.tell()
+        original_size = source.seek(0, io.SEEK_END) - start
+        source.seek(start)
+
+        image_size = int(image_size)
+        image = Image.open(source)
+        mode = 'L' if self.grayscale else 'RGB'
+        # JPEG 可在解码时直接按 1/2、1/4、1/8 缩小，省去大部分解码开销
+        image.draft(mode, (image_size, image_size))
+
+        if image.mode not in ('L', 'RGB'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+            if image.mode == 'RGBA':
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+        if image.mode != mode:
+            image = image.convert(mode)
+
+        if max(image.size) > image_size:
+            image.thumbnail((image_size, image_size), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+        buffer = io.BytesIO()
+        if self.fmt == 'PNG':
+            image.save(buffer, format='PNG', optimize=True)
+        else:
+            image.save(buffer, format=self.fmt, quality=self.quality)
+        source.seek(start)
+        prepared = buffer.getvalue()
+        return prepared if len(prepared) < original_size else None
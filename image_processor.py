@@ -1,26 +1,26 @@
 # image_ocr_processor.py
 
-from image_models.ocr_table_updater import OCRTablerUpdater
-from image_models.word_cropper import WordCropper
-from PIL import Image
+from image_models.ocr_result import EXPORT_THUMBNAIL_SIZE, OCRPage
+from image_models.page_image import PageImage
 
 
 class ImageProcessor:
-    def __init__(self, image_path, ocr_data):
-        self.image_path = image_path
+    def __init__(self, image, ocr_data):
+        # 图像路径或上传时用过的 PageImage，传后者时不再重新读取、解码
+        self.page_image = PageImage.of(image)
+        self.image_path = self.page_image.path
         self.ocr_data = ocr_data
 
     def process_image(self):
-        image = Image.open(self.image_path)
+        # 页面图像与框坐标分开保存：不再把框画进图像，由 ImageViewer 以矢量图层叠加显示；
+        # 单字只记录框坐标，切图在需要时才从原始页面裁剪，缩略图中不会混入框线
+        return OCRPage.from_response(self.ocr_data, self.image_path, self.page_image)
 
-        # 使用 OCRTablerUpdater 来框选文本行
-        updater = OCRTablerUpdater(image, self.ocr_data)
-        boxed_image = updater.update_table()  # 处理图像并返回图像对象
 
-        # 使用 WordCropper 来处理单个字的切割
-        scale_width, scale_height = updater._calculate_scale()
-        cropper = WordCropper(boxed_image, updater.ocr_data, scale_width, scale_height)
-        words_data = cropper.crop_words()
-
-        # 返回处理后的图像对象和文字数据
-        return boxed_image, words_data
+def post_process_page(image_path, ocr_data, thumbnail_size=EXPORT_THUMBNAIL_SIZE):
+    """进程池入口：解析框坐标并预编码单字缩略图，返回的 OCRPage 不含页面像素，可直接序列化传回"""
+    page = ImageProcessor(image_path, ocr_data).process_image()
+    if thumbnail_size and page.words is not None:
+        page.words.encode_thumbnails(thumbnail_size)
+    page.release_image()
+    return page
@@ -1,42 +1,109 @@
 import sys
-from PyQt5.QtCore import QByteArray, QBuffer, QIODevice
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtWidgets import QApplication, QFileDialog, QTableWidgetItem
+from utils.startup_profiler import StartupProfiler
+
+# 需在其它导入之前创建，才能统计到各模块的导入耗时
+startup_profiler = StartupProfiler.from_argv(sys.argv)
+
+import importlib
+import logging
+import threading
+from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtWidgets import QApplication, QFileDialog
 
 import time
 from utils.config_manager import ConfigManager
 from ocr_ui import OCRUi
-from utils.thumbnail_viewer import ThumbnailViewer
-from utils.image_processing_thread import ImageProcessingThread  # 导入新的图像处理线程
 from utils.ocr_display import OCRDisplay
-from utils.ocr_thread import OCRThread
-from utils.excel_woker import SaveExcelWorker
-from utils.shot_screen import take_area_screenshot
+from image_models.constants import OCR_API_URL
+from image_models.page_image import PageImage
+
+# 这些模块会拖入 requests、PIL、openpyxl 等重量级依赖，窗口显示后在后台预热，首次使用时再真正导入
+DEFERRED_MODULES = (
+    'utils.ocr_thread',
+    'utils.image_processing_thread',
+    'utils.batch_ocr_thread',
+    'utils.excel_woker',
+    'utils.shot_screen',
+    'image_models.ocr_client',
+    'image_models.ocr_cache',
+    'image_models.upload_preparer',
+    'image_models.image_ocr_processor',
+)
+
+# 关闭窗口时等待工作线程的每段时长（毫秒），其间处理一次事件
+THREAD_WAIT_SLICE_MS = 20
+
 
 class OCRApp(OCRUi):
     def __init__(self):
         super().__init__()
         self.image_path = None
+        # 当前页的共享句柄：显示、上传、切图共用一次读取与解码
+        self.page_image = None
         self.config_manager = ConfigManager()
+        self._ocr_client = None
+        self._ocr_cache = None
         self.btn_select_file.clicked.connect(self.openFileNameDialog)
         self.btn_execute.clicked.connect(self.executeOCR)
         self.ocr_display = OCRDisplay(self.ocr_result_textbox)
         self.save_excel_btn.clicked.connect(self.saveTableToExcel)  
         self.shot_screen_btn.clicked.connect(self.getScreenShot)
+        self.btn_batch_folder.clicked.connect(self.executeBatchOCR)
+        self.btn_stop_fill.clicked.connect(self.stopTableFill)
+        self.image_processing_thread = None
+        self.image_viewer.word_clicked.connect(self.selectWordRow)
+        self.batch_thread = None
         self.loadSettings()
 
+    @property
+    def ocr_client(self):
+        """所有 OCR 线程共享同一个连接池，首次使用时创建"""
+        if self._ocr_client is None:
+            from image_models.ocr_client import OCRClient
+            self._ocr_client = OCRClient(url=self.api_url_input.text().strip() or OCR_API_URL, pool_size=16)
+        return self._ocr_client
+
+    @property
+    def ocr_cache(self):
+        """相同图像与参数直接复用上次的识别结果，首次使用时打开"""
+        if self._ocr_cache is None:
+            from image_models.ocr_cache import OCRResponseCache
+            self._ocr_cache = OCRResponseCache()
+        return self._ocr_cache
+
+    def warmUpModules(self):
+        """窗口显示后在后台线程预先导入重量级模块"""
+        def warm_up():
+            for name in DEFERRED_MODULES:
+                importlib.import_module(name)
+
+        threading.Thread(target=warm_up, daemon=True).start()
+
     def getScreenShot(self):
         """截图功能实现"""
         self.hide()  # ✅ 隐藏整个窗口
         time.sleep(0.1)
         try:
-            # 进行区域截图
-            screenshot_pixmap, img_path = take_area_screenshot("images")
-            if screenshot_pixmap and not screenshot_pixmap.isNull() and img_path:
-                self.image_path = img_path  # 保存截图路径
+            from utils.shot_screen import take_area_screenshot, save_screenshot_async
+            from utils.qt_image_bridge import encode_for_upload, qimage_to_pil
+            # 进行区域截图，不在这里同步写盘
+            screenshot_pixmap, _ = take_area_screenshot("images", save=False)
+            if screenshot_pixmap and not screenshot_pixmap.isNull():
+                # 按上传设置直接在内存中编码，识别时不再读文件、不再重新压缩
+                image = screenshot_pixmap.toImage()
+                upload_bytes = encode_for_upload(image, self.upload_format_combo.currentData(),
+                                                 self.upload_quality_spin.value(),
+                                                 self.upload_grayscale_checkbox.isChecked(),
+                                                 int(self.image_size_input.text()))
+                self.page_image = PageImage(data=upload_bytes, image=qimage_to_pil(image))
+                self.image_path = None
+                if self.screenshot_save_checkbox.isChecked():
+                    self.image_path = save_screenshot_async(screenshot_pixmap, "images")  # 保存截图路径
                 # 截图成功，加载到图像查看器
                 self.image_viewer.loadImage(screenshot_pixmap)
-                # print("截图完成并已加载到图像查看器")
+                if self.screenshot_ocr_checkbox.isChecked():
+                    # 窗口重新显示后立即识别
+                    QTimer.singleShot(0, self.executeOCR)
                 return True
             else:
                 # print("截图被取消或失败")
@@ -49,20 +116,19 @@ class OCRApp(OCRUi):
             self.show()  # ✅ 截图完成后重新显示窗口
     
     def saveTableToExcel(self):
-        row_count = self.ocr_table.rowCount()
+        row_count = self.ocr_proxy.rowCount()
         if not row_count:
             return
         
-        # 收集数据
+        # 按表格当前的排序与筛选收集数据，切图在工作线程中才从页面裁剪
         table_data = []
         for row in range(row_count):
-            thumbnail_viewer = self.ocr_table.cellWidget(row, 0)
-            character = self.ocr_table.item(row, 1).text()
-            confidence = self.ocr_table.item(row, 2).text()
-            table_data.append((thumbnail_viewer, character, confidence))
+            word = self.ocr_model.word(self.ocr_proxy.mapToSource(self.ocr_proxy.index(row, 0)).row())
+            table_data.append((word, word.text, str(word.confidence)))
         
         # 创建并启动工作线程
-        self.worker = SaveExcelWorker(table_data)
+        from utils.excel_woker import SaveExcelWorker
+        self.worker = SaveExcelWorker(table_data, self.thumbnail_cache)
         self.worker.finished.connect(lambda: print("Excel保存完成"))
         self.worker.error.connect(lambda err: print(f"保存失败: {err}"))
         self.worker.start()
@@ -74,7 +140,8 @@ class OCRApp(OCRUi):
                                                   "All Files (*);;Image Files (*.png *.jpg *.jpeg)", options=options)
         if fileName:
             self.image_path = fileName
-            self.image_viewer.loadImage(fileName)
+            self.page_image = PageImage(fileName)
+            self.image_viewer.loadImage(self.page_image)
 
     def loadSettings(self):
         settings = self.config_manager.load_settings()
@@ -84,6 +151,21 @@ class OCRApp(OCRUi):
         self.image_size_input.setText(str(settings["image_size"]))
         self.char_det_radio.setChecked(settings["char_ocr"])
         self.line_det_radio.setChecked(not settings["char_ocr"])
+        self.batch_workers_spin.setValue(settings["batch_workers"])
+        self.batch_async_checkbox.setChecked(settings["batch_async"])
+        self.batch_rps = settings["batch_rps"]
+        self.batch_in_flight = settings["batch_in_flight"]
+        self.upload_format_combo.setCurrentIndex(self.upload_format_combo.findData(settings["upload_format"]))
+        self.upload_quality_spin.setValue(settings["upload_quality"])
+        self.upload_grayscale_checkbox.setChecked(settings["upload_grayscale"])
+        self.api_url_input.setText(settings["api_url"])
+        self.tile_size_spin.setValue(settings["tile_size"])
+        for step, checked in settings["preprocess_steps"].items():
+            self.preprocess_checkboxes[step].setChecked(checked)
+        self.screenshot_ocr_checkbox.setChecked(settings["screenshot_auto_ocr"])
+        self.screenshot_save_checkbox.setChecked(settings["screenshot_save"])
+        self.thumbnail_cache.setBudget(settings["thumbnail_cache_mb"] * 1024 * 1024)
+        self.log_box.configure(settings["log_level"], settings["log_buffer_lines"], settings["log_file"])
 
     def saveSettings(self):
         if self.save_settings_checkbox.isChecked():
@@ -93,14 +175,59 @@ class OCRApp(OCRUi):
             return_position = True  # 根据需要设置
             return_choices = True  # 根据需要设置
             self.config_manager.save_settings(self.api_token_input.text(), self.email_input.text(),
-                                              det_mode, image_size, char_ocr, return_position, return_choices)
+                                              det_mode, image_size, char_ocr, return_position, return_choices,
+                                              self.batch_workers_spin.value(),
+                                              self.upload_format_combo.currentData(),
+                                              self.upload_quality_spin.value(),
+                                              self.upload_grayscale_checkbox.isChecked(),
+                                              self.api_url_input.text().strip() or OCR_API_URL,
+                                              self.tile_size_spin.value(),
+                                              self.preprocessSteps(),
+                                              self.screenshot_ocr_checkbox.isChecked(),
+                                              self.screenshot_save_checkbox.isChecked(),
+                                              self.log_box.level(),
+                                              self.batch_async_checkbox.isChecked())
+
+    def applyApiUrl(self):
+        self.ocr_client.url = self.api_url_input.text().strip() or OCR_API_URL
+
+    def buildUploadPreparer(self):
+        upload_format = self.upload_format_combo.currentData()
+        if upload_format == "original":
+            return None
+        from image_models.upload_preparer import UploadPreparer
+        return UploadPreparer(upload_format, self.upload_quality_spin.value(),
+                              self.upload_grayscale_checkbox.isChecked())
+
+    def buildAsyncProcessor(self, processor):
+        """勾选异步并发上传时包装出 AsyncImageOCRProcessor；未安装 aiohttp 时退回线程池上传"""
+        if not self.batch_async_checkbox.isChecked():
+            return None
+        try:
+            from image_models.async_ocr_processor import AsyncImageOCRProcessor
+        except ImportError:
+            self.log_box.log("异步并发上传需要安装 aiohttp，改用线程池上传", logging.WARNING)
+            return None
+        return AsyncImageOCRProcessor(processor, requests_per_second=self.batch_rps,
+                                      max_in_flight=self.batch_in_flight)
+
+    def preprocessSteps(self):
+        return {step: checkbox.isChecked() for step, checkbox in self.preprocess_checkboxes.items()}
+
+    def buildPreprocessor(self):
+        steps = self.preprocessSteps()
+        if not any(steps.values()):
+            return None
+        from image_models.preprocess import Preprocessor
+        return Preprocessor(**steps)
 
     def executeOCR(self):
         self.log_box.log("开始执行OCR...")
-        if self.image_path is None:
-            self.log_box.log("错误：未选择文件。请先选择一个图像文件。")
+        if self.page_image is None:
+            self.log_box.log("错误：未选择文件。请先选择一个图像文件。", logging.WARNING)
             return
 
+        self.applyApiUrl()
         api_token = self.api_token_input.text()
         email = self.email_input.text()
         det_mode = self.det_mode_combo.currentData()
@@ -109,70 +236,182 @@ class OCRApp(OCRUi):
         return_position = True
         return_choices = True
 
-        self.ocr_thread = OCRThread(self.image_path, api_token, email, self.log_box,
-                                    image_size, char_ocr, det_mode, return_position, return_choices)
+        from utils.ocr_thread import OCRThread
+        self.ocr_thread = OCRThread(self.page_image, api_token, email, self.log_box,
+                                    image_size, char_ocr, det_mode, return_position, return_choices,
+                                    client=self.ocr_client, cache=self.ocr_cache,
+                                    # 内存中的截图已按上传设置编码，不再重新压缩
+                                    preparer=self.buildUploadPreparer() if self.page_image.path else None,
+                                    tile_size=self.tile_size_spin.value() or None,
+                                    preprocessor=self.buildPreprocessor())
         self.ocr_thread.result_signal.connect(self.onOCRComplete)
         self.ocr_thread.start()
 
         self.saveSettings()
 
+    def executeBatchOCR(self):
+        if self.batch_thread is not None and self.batch_thread.isRunning():
+            self.batch_thread.cancel()
+            self.log_box.log("正在取消批量识别...")
+            return
+
+        folder = QFileDialog.getExistingDirectory(self, "选择图像文件夹")
+        if not folder:
+            return
+
+        self.applyApiUrl()
+        ocr_options = {
+            'image_size': int(self.image_size_input.text()),
+            'char_ocr': self.char_det_radio.isChecked(),
+            'det_mode': self.det_mode_combo.currentData(),
+            'return_position': True,
+            'return_choices': True,
+        }
+        from image_models.image_ocr_processor import ImageOCRProcessor
+        from utils.batch_ocr_thread import BatchOCRThread
+        processor = ImageOCRProcessor(self.api_token_input.text(), self.email_input.text(), self.log_box,
+                                      self.ocr_client, self.ocr_cache, self.buildUploadPreparer(),
+                                      tile_size=self.tile_size_spin.value() or None,
+                                      preprocessor=self.buildPreprocessor())
+
+        self.log_box.log(f"开始批量识别: {folder}")
+        self.ocr_result_textbox.clear()
+        self.thumbnail_cache.clear()
+        self.ocr_model.clear()
+        self.batch_thread = BatchOCRThread(folder, processor, ocr_options, self.batch_workers_spin.value(),
+                                           async_processor=self.buildAsyncProcessor(processor))
+        self.batch_thread.page_signal.connect(self.onBatchPageComplete)
+        self.batch_thread.progress_signal.connect(self.onBatchProgress)
+        self.batch_thread.finished_signal.connect(self.onBatchFinished)
+        self.batch_thread.start()
+        self.btn_batch_folder.setText('取消批量识别')
+
+        self.saveSettings()
+
+    def onBatchPageComplete(self, result):
+        page_no = result.index + 1
+        if not result.ok:
+            self.log_box.log(f"第 {page_no} 页失败: {result.error}", logging.ERROR)
+            return
+        for text in result.response['data']['texts']:
+            self.ocr_result_textbox.append(text)
+        if result.page is not None:
+            self.updateOCRTable(result.page.words, append=True)
+        self.image_path = result.image_path
+        self.page_image = result.page_image
+        self.image_viewer.loadImage(result.page_image)
+        self.image_viewer.setOverlay(result.page)
+
+    def onBatchProgress(self, done, total, pages_per_minute):
+        self.log_box.log(f"已完成 {done}/{total} 页，速度 {pages_per_minute:.1f} 页/分钟")
+
+    def onBatchFinished(self, results):
+        failed = sum(1 for result in results if not result.ok)
+        self.log_box.log(f"批量识别结束：共 {len(results)} 页，失败 {failed} 页")
+        self.btn_batch_folder.setText('批量识别文件夹')
+
+    def waitForThread(self, thread):
+        """请求线程停止并等它结束；等待时继续处理事件，线程阻塞在阻塞式排队信号上时也能退出，不会互相等待"""
+        if thread is None or not thread.isRunning():
+            return
+        thread.cancel()
+        while not thread.wait(THREAD_WAIT_SLICE_MS):
+            QApplication.processEvents()
+
+    def closeEvent(self, event):
+        # 先停下仍在使用客户端、缓存与表格的线程，再关闭它们
+        self.waitForThread(self.image_processing_thread)
+        self.waitForThread(self.batch_thread)
+        if self._ocr_client is not None:
+            stats = self._ocr_client.get_stats()
+            self.log_box.log(f"OCR请求统计: 请求 {stats['requests']} 次, 重试 {stats['retries']} 次, "
+                             f"失败 {stats['failures']} 次", logging.DEBUG)
+            self._ocr_client.close()
+        if self._ocr_cache is not None:
+            cache_stats = self._ocr_cache.get_stats()
+            self.log_box.log(f"OCR缓存统计: 命中 {cache_stats['hits']} 次, 未命中 {cache_stats['misses']} 次, "
+                             f"条目 {cache_stats['entries']} 个", logging.DEBUG)
+            self._ocr_cache.close()
+        super().closeEvent(event)
+
     def onOCRComplete(self, response):
         if response:
             self.ocr_display.display_result(response)
-            self.image_processing_thread = ImageProcessingThread(self.image_path, response)
+            from utils.image_processing_thread import ImageProcessingThread
+            # 上一页还在填充时先停止，它已排队的批次由 sender 检查丢弃
+            self.stopTableFill()
+            self.image_processing_thread = ImageProcessingThread(self.page_image, response)
+            self.image_processing_thread.page_signal.connect(self.onPageParsed)
+            # 阻塞式排队连接：上一批插入完成后工作线程才发送下一批，批次不会在事件队列中堆积
+            self.image_processing_thread.rows_signal.connect(self.onWordRows, Qt.BlockingQueuedConnection)
+            self.image_processing_thread.progress_signal.connect(self.onTableFillProgress)
             self.image_processing_thread.finished_signal.connect(self.onImageProcessingComplete)
             self.image_processing_thread.start()
             self.log_box.log("OCR处理完成")
         else:
-            self.log_box.log("OCR处理失败")
+            self.log_box.log("OCR处理失败", logging.ERROR)
 
-    def onImageProcessingComplete(self, boxed_image, words_data):
-        # 处理 words_data 更新 OCR 表格
-        if isinstance(words_data, list):
-            self.updateOCRTable(words_data)
-        else:
-            self.log_box.log("错误：words_data 不是列表类型。")
-
-        # 将 boxed_image (PIL图像) 传递给 ImageViewer
-        self.image_viewer.loadImage(boxed_image)  # 使用 ImageViewer 的 loadImage 方法
-
-    def updateOCRTable(self, words_data):
-        self.ocr_table.setRowCount(len(words_data))
-        for row, word_data in enumerate(words_data):
-            if isinstance(word_data, dict) and {'image', 'text', 'confidence'}.issubset(word_data):
-                # 显示裁剪后的图像
-                cropped_image = word_data['image']
-
-                # 将 PIL 图像转换为 QByteArray
-                byte_array = QByteArray()
-                buffer = QBuffer(byte_array)
-                buffer.open(QIODevice.WriteOnly)
-                cropped_image.save(buffer, 'PNG')  # 保存为 PNG 格式
-                buffer.close()
-
-                pixmap = QPixmap()
-                pixmap.loadFromData(byte_array, 'PNG')
-
-                # 创建 ThumbnailViewer 实例并设置 QPixmap
-                thumbnail_viewer = ThumbnailViewer()
-                thumbnail_viewer.setThumbnail(pixmap)
-
-                # 将 ThumbnailViewer 添加到表格中
-                self.ocr_table.setCellWidget(row, 0, thumbnail_viewer)
-
-                # 显示文字内容
-                text_item = QTableWidgetItem(word_data['text'])
-                self.ocr_table.setItem(row, 1, text_item)
-
-                # 显示置信度
-                confidence_item = QTableWidgetItem(str(word_data['confidence']))
-                self.ocr_table.setItem(row, 2, confidence_item)
-            else:
-                self.log_box.log(f"错误：无效的词条数据格式（行 {row}）。")
+    def onPageParsed(self, page):
+        if self.sender() is not self.image_processing_thread:
+            return
+        self.updateOCRTable([])
+        if page is None or page.words is None:
+            self.log_box.log("错误：没有可显示的单字结果。", logging.WARNING)
+            return
+
+        # 查看器中已是该页原图，只需叠加检测框；表格随后分批填充，期间可正常操作
+        if page.image is self.page_image:
+            self.image_viewer.setOverlay(page)
+        self.table_progress.setRange(0, len(page.words))
+        self.table_progress.setValue(0)
+        self.table_progress.show()
+        self.btn_stop_fill.show()
+
+    def onWordRows(self, words):
+        if self.sender() is self.image_processing_thread:
+            self.updateOCRTable(words, append=True)
+
+    def onTableFillProgress(self, done, total):
+        if self.sender() is self.image_processing_thread:
+            self.table_progress.setValue(done)
+
+    def stopTableFill(self):
+        if self.image_processing_thread is not None and self.image_processing_thread.isRunning():
+            self.image_processing_thread.cancel()
 
+    def onImageProcessingComplete(self, page):
+        if self.sender() is not self.image_processing_thread:
+            return
+        self.table_progress.hide()
+        self.btn_stop_fill.hide()
+        if page is not None and page.words is not None and self.table_progress.value() < len(page.words):
+            self.log_box.log(f"已停止加载：显示 {self.table_progress.value()}/{len(page.words)} 个单字")
+
+    def selectWordRow(self, word):
+        """点击页面上的单字框时选中表格中对应的行"""
+        row = self.ocr_model.findWord(word)
+        if row < 0:
+            return
+        index = self.ocr_proxy.mapFromSource(self.ocr_model.index(row, 0))
+        if index.isValid():
+            self.ocr_table.selectRow(index.row())
+            self.ocr_table.scrollTo(index)
+
+    def updateOCRTable(self, words, append=False):
+        if append:
+            self.ocr_model.appendWords(words)
+        else:
+            self.thumbnail_cache.clear()
+            self.ocr_model.setWords(words)
 
 if __name__ == '__main__':
+    startup_profiler.mark('导入模块')
     app = QApplication(sys.argv)
+    startup_profiler.mark('创建 QApplication')
     ex = OCRApp()
+    startup_profiler.mark('构建主窗口')
+    startup_profiler.watch_first_paint(ex)
     ex.show()
+    startup_profiler.mark('显示主窗口')
+    QTimer.singleShot(0, ex.warmUpModules)
     sys.exit(app.exec_())
@@ -1,18 +1,20 @@
-from PyQt5.QtWidgets import QTableWidget, QLabel
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QTableView, QLabel, QHeaderView, QDoubleSpinBox, QProgressBar
 from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QComboBox, QGroupBox, QRadioButton, \
-    QCheckBox, QWidget, QSizePolicy, QTextEdit
-from PyQt5.QtGui import QIcon
+    QCheckBox, QWidget, QSizePolicy, QTextEdit, QSpinBox, QGridLayout
 from utils.thumbnail_viewer import ThumbnailViewer
+from utils.thumbnail_cache import ThumbnailCache
+from utils.ocr_table_model import OCRTableModel, ConfidenceFilterProxy, ThumbnailDelegate, THUMBNAIL_COLUMN
 from image_models.image_viewer import ImageViewer
 from utils.logs import LogBox
 from utils.table_operations import TableOperationsMixin
-from utils.logo import get_logo_pixmap
+from utils.logo import get_logo_icon
 
 class OCRUi(QWidget, TableOperationsMixin):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("影文OCR")
-        self.setWindowIcon(QIcon(get_logo_pixmap()))  # 设置窗口图标，暂时注释
+        self.setWindowIcon(get_logo_icon())  # 设置窗口图标
         self.initUI()
 
     def initUI(self):
@@ -24,8 +26,19 @@ class OCRUi(QWidget, TableOperationsMixin):
         # 文件选择按钮
         self.btn_select_file = QPushButton('选择文件')
         self.shot_screen_btn = QPushButton('截图')
+        self.btn_batch_folder = QPushButton('批量识别文件夹')
         left_layout.addWidget(self.btn_select_file)
         left_layout.addWidget(self.shot_screen_btn)
+        # 截图直接在内存中编码上传；保存到 images/ 为可选，在后台进行
+        self.screenshot_ocr_checkbox = QCheckBox("截图后立即识别")
+        self.screenshot_ocr_checkbox.setChecked(True)
+        self.screenshot_save_checkbox = QCheckBox("保存截图")
+        self.screenshot_save_checkbox.setChecked(True)
+        screenshot_layout = QHBoxLayout()
+        screenshot_layout.addWidget(self.screenshot_ocr_checkbox)
+        screenshot_layout.addWidget(self.screenshot_save_checkbox)
+        left_layout.addLayout(screenshot_layout)
+        left_layout.addWidget(self.btn_batch_folder)
 
         # API Token 输入框
         self.api_token_input = QLineEdit(self)
@@ -37,6 +50,11 @@ class OCRUi(QWidget, TableOperationsMixin):
         left_layout.addWidget(QLabel('登录账号(必填):'))
         left_layout.addWidget(self.email_input)
 
+        # OCR 接口地址，可指向本地模拟服务
+        self.api_url_input = QLineEdit(self)
+        left_layout.addWidget(QLabel('API地址:'))
+        left_layout.addWidget(self.api_url_input)
+
         # 修改后的文字排版方向下拉菜单
         self.det_mode_combo = QComboBox(self)
         self.det_mode_combo.addItem("自动", "auto")
@@ -62,6 +80,55 @@ class OCRUi(QWidget, TableOperationsMixin):
         left_layout.addWidget(QLabel('图片尺寸调节:'))
         left_layout.addWidget(self.image_size_input)
 
+        # 上传前压缩：格式、质量、灰度
+        self.upload_format_combo = QComboBox(self)
+        self.upload_format_combo.addItem("原图", "original")
+        self.upload_format_combo.addItem("JPEG", "JPEG")
+        self.upload_format_combo.addItem("WebP", "WEBP")
+        self.upload_format_combo.addItem("PNG", "PNG")
+        self.upload_quality_spin = QSpinBox(self)
+        self.upload_quality_spin.setRange(10, 100)
+        self.upload_quality_spin.setValue(85)
+        self.upload_grayscale_checkbox = QCheckBox("灰度")
+        self.upload_grayscale_checkbox.setChecked(True)
+        upload_layout = QHBoxLayout()
+        upload_layout.addWidget(self.upload_format_combo)
+        upload_layout.addWidget(self.upload_quality_spin)
+        upload_layout.addWidget(self.upload_grayscale_checkbox)
+        left_layout.addWidget(QLabel('上传格式/质量:'))
+        left_layout.addLayout(upload_layout)
+
+        # 上传前预处理，各步骤单独开关
+        self.preprocess_group = QGroupBox("预处理")
+        preprocess_layout = QGridLayout()
+        self.preprocess_checkboxes = {}
+        for index, (step, label) in enumerate((("deskew", "纠斜"), ("crop_margins", "裁边"), ("contrast", "增强对比"),
+                                               ("binarize", "二值化"), ("despeckle", "去噪点"))):
+            checkbox = QCheckBox(label)
+            self.preprocess_checkboxes[step] = checkbox
+            preprocess_layout.addWidget(checkbox, index // 3, index % 3)
+        self.preprocess_group.setLayout(preprocess_layout)
+        left_layout.addWidget(self.preprocess_group)
+
+        # 超大页面分块识别，0 为关闭
+        self.tile_size_spin = QSpinBox(self)
+        self.tile_size_spin.setRange(0, 16384)
+        self.tile_size_spin.setSingleStep(512)
+        self.tile_size_spin.setSpecialValueText("关闭")
+        left_layout.addWidget(QLabel('大图分块尺寸:'))
+        left_layout.addWidget(self.tile_size_spin)
+
+        # 批量识别并发数
+        self.batch_workers_spin = QSpinBox(self)
+        self.batch_workers_spin.setRange(1, 16)
+        self.batch_workers_spin.setValue(4)
+        left_layout.addWidget(QLabel('批量并发数:'))
+        left_layout.addWidget(self.batch_workers_spin)
+        # 批量识别改由事件循环并发上传（需安装 aiohttp），速率与并发上限在 config.ini 中修改
+        self.batch_async_checkbox = QCheckBox("异步并发上传")
+        self.batch_async_checkbox.setChecked(False)
+        left_layout.addWidget(self.batch_async_checkbox)
+
         # 是否保存设置勾选框
         self.save_settings_checkbox = QCheckBox("保存设置")
         self.save_settings_checkbox.setChecked(True)
@@ -90,12 +157,48 @@ class OCRUi(QWidget, TableOperationsMixin):
         self.save_excel_btn = QPushButton('保存为Excel')
         right_layout.addWidget(self.save_excel_btn)
 
-        # 表格
-        self.ocr_table = QTableWidget(self)
-        self.ocr_table.setColumnCount(3)
-        self.ocr_table.setHorizontalHeaderLabels(['图像', 'OCR内容', '置信度'])
+        # 置信度筛选
+        self.min_confidence_spin = QDoubleSpinBox(self)
+        self.max_confidence_spin = QDoubleSpinBox(self)
+        for spin, value in ((self.min_confidence_spin, 0.0), (self.max_confidence_spin, 1.0)):
+            spin.setRange(0.0, 1.0)
+            spin.setSingleStep(0.05)
+            spin.setDecimals(2)
+            spin.setValue(value)
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel('置信度范围:'))
+        filter_layout.addWidget(self.min_confidence_spin)
+        filter_layout.addWidget(QLabel('至'))
+        filter_layout.addWidget(self.max_confidence_spin)
+        right_layout.addLayout(filter_layout)
+
+        # 表格：模型直接持有单字结果，缩略图由委托在绘制可见行时从缓存取出
+        self.thumbnail_cache = ThumbnailCache()
+        self.ocr_model = OCRTableModel(self)
+        self.ocr_proxy = ConfidenceFilterProxy(self)
+        self.ocr_proxy.setSourceModel(self.ocr_model)
+        self.ocr_table = QTableView(self)
+        self.ocr_table.setModel(self.ocr_proxy)
+        self.ocr_table.setItemDelegateForColumn(THUMBNAIL_COLUMN, ThumbnailDelegate(self.thumbnail_cache, self.ocr_table))
+        self.ocr_table.setSortingEnabled(True)
+        self.ocr_table.sortByColumn(-1, Qt.AscendingOrder)  # 初始保持识别顺序
+        # 固定行高，滚动时不必逐行计算尺寸
+        self.ocr_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.ocr_table.verticalHeader().setDefaultSectionSize(40)
         right_layout.addWidget(self.ocr_table)
         self.setup_table_context_menu(self.ocr_table)
+        self.min_confidence_spin.valueChanged.connect(self.applyConfidenceFilter)
+        self.max_confidence_spin.valueChanged.connect(self.applyConfidenceFilter)
+
+        # 分批填充表格时的进度与停止按钮，空闲时隐藏
+        self.table_progress = QProgressBar(self)
+        self.btn_stop_fill = QPushButton('停止加载')
+        progress_layout = QHBoxLayout()
+        progress_layout.addWidget(self.table_progress)
+        progress_layout.addWidget(self.btn_stop_fill)
+        right_layout.addLayout(progress_layout)
+        self.table_progress.hide()
+        self.btn_stop_fill.hide()
 
         # 创建 ThumbnailViewer 实例并添加到布局中
         self.thumbnail_viewer = ThumbnailViewer()
@@ -114,3 +217,6 @@ class OCRUi(QWidget, TableOperationsMixin):
         self.setMinimumSize(1400, 900)
         self.api_token_input.setMinimumWidth(200)
         self.email_input.setMinimumWidth(200)
+
+    def applyConfidenceFilter(self):
+        self.ocr_proxy.setConfidenceRange(self.min_confidence_spin.value(), self.max_confidence_spin.value())
@@ -0,0 +1,47 @@
+# tests/test_batch_ocr_thread.py
+
+import logging
+
+from PIL import Image
+
+from image_models.async_ocr_processor import AsyncImageOCRProcessor
+from image_models.image_ocr_processor import ImageOCRProcessor
+from utils.batch_ocr_thread import BatchOCRThread
+from utils.mock_ocr_server import start_mock_server
+
+OCR_OPTIONS = {'image_size': 1024, 'char_ocr': True, 'det_mode': 'sp',
+               'return_position': True, 'return_choices': True}
+
+
+class ListLog:
+    def __init__(self):
+        self.records = []
+
+    def log(self, message, level=logging.INFO):
+        self.records.append((level, message))
+
+
+def test_batch_thread_uploads_through_async_processor(qapp, tmp_path):
+    for i in range(6):
+        Image.new('L', (200, 300), 255).save(tmp_path / f'page-{i + 1}.png')
+    server, url = start_mock_server(error_rate=0.3, seed=7)
+    try:
+        processor = ImageOCRProcessor('token', 'mail', ListLog(), api_url=url)
+        async_processor = AsyncImageOCRProcessor(processor, requests_per_second=100, max_in_flight=4,
+                                                 max_retries=8, backoff_base=0.01, backoff_max=0.05)
+        thread = BatchOCRThread(str(tmp_path), processor, OCR_OPTIONS, 2, async_processor=async_processor)
+        results = []
+        thread.finished_signal.connect(results.extend)
+        thread.start()
+        while not thread.wait(50):
+            qapp.processEvents()
+        qapp.processEvents()
+    finally:
+        server.shutdown()
+
+    assert [result.index for result in results] == list(range(6))
+    assert all(result.ok for result in results)
+    # 请求全部经由异步上传层发出，服务端的 500 也由它重试
+    stats = async_processor.get_stats()
+    assert stats['requests'] == 6 + stats['retries']
+    assert stats['retries'] > 0
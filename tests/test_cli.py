@@ -0,0 +1,20 @@
+# tests/test_cli.py
+
+import logging
+
+from yingwen.cli import ConsoleLog
+
+
+def test_console_log_always_prints_warnings_and_errors(capsys):
+    log = ConsoleLog(verbose=False)
+    log.log('进度', logging.INFO)
+    log.log('重试', logging.WARNING)
+    log.log('请求失败', logging.ERROR)
+    assert capsys.readouterr().err.splitlines() == ['重试', '请求失败']
+
+
+def test_console_log_verbose_prints_everything(capsys):
+    log = ConsoleLog(verbose=True)
+    log.log('命中缓存', logging.DEBUG)
+    log.log('进度')
+    assert capsys.readouterr().err.splitlines() == ['命中缓存', '进度']
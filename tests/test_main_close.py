@@ -0,0 +1,40 @@
+# tests/test_main_close.py
+
+from PyQt5.QtCore import QThread, Qt, pyqtSignal
+
+
+class BlockingFillThread(QThread):
+    """与 ImageProcessingThread 一样以阻塞式排队连接逐批发送，直到被取消"""
+
+    rows_signal = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.batches = 0
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        while not self.isInterruptionRequested():
+            self.rows_signal.emit([])
+            self.batches += 1
+
+
+def test_close_stops_fill_thread_without_deadlock(qapp):
+    import main
+
+    window = main.OCRApp()
+    thread = BlockingFillThread()
+    received = []
+    thread.rows_signal.connect(received.append, Qt.BlockingQueuedConnection)
+    window.image_processing_thread = thread
+    thread.start()
+    # 让工作线程先阻塞在一次发送上，界面线程此时还没有处理它
+    while thread.batches == 0 and not received:
+        qapp.processEvents()
+        thread.msleep(1)
+
+    window.close()
+
+    assert thread.isFinished()
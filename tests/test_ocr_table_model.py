@@ -0,0 +1,61 @@
+# tests/test_ocr_table_model.py
+
+import numpy as np
+from PyQt5.QtCore import Qt
+
+from image_models.ocr_result import OCRWordTable
+from utils.ocr_table_model import CONFIDENCE_COLUMN, TEXT_COLUMN, THUMBNAIL_COLUMN, OCRTableModel
+
+TEXTS = list('天地玄黄宇宙洪荒')
+CONFIDENCES = [0.9, 0.3, 0.7, 0.5, 0.8, 0.2, 0.6, 0.4]
+
+
+def make_table(start, stop):
+    count = stop - start
+    return OCRWordTable(None, TEXTS[start:stop], np.array(CONFIDENCES[start:stop]), np.zeros((count, 4), np.int32),
+                        np.zeros(count, np.int32))
+
+
+def make_model(count=len(TEXTS)):
+    model = OCRTableModel()
+    model.setWords(make_table(0, count))
+    return model
+
+
+def texts(model):
+    return [word.text for word in model.words()]
+
+
+def confidences(model):
+    return [word.confidence for word in model.words()]
+
+
+def test_undo_after_resort_restores_sorted_rows(qapp):
+    model = make_model()
+    model.sort(CONFIDENCE_COLUMN, Qt.AscendingOrder)
+    model.removeRowSet([0, 3, 4], '删除')
+    model.sort(TEXT_COLUMN, Qt.DescendingOrder)
+    model.undo_stack.undo()
+
+    assert sorted(texts(model)) == sorted(TEXTS)
+    assert texts(model) == sorted(TEXTS, reverse=True)
+
+
+def test_undo_after_append_keeps_confidence_order(qapp):
+    model = make_model(6)
+    model.sort(CONFIDENCE_COLUMN, Qt.DescendingOrder)
+    model.removeRowSet([3, 4], '删除')
+    model.appendWords(make_table(6, len(TEXTS)))
+    model.undo_stack.undo()
+
+    assert confidences(model) == sorted(CONFIDENCES, reverse=True)
+    model.undo_stack.redo()
+    assert len(model.words()) == len(TEXTS) - 2
+
+
+def test_undo_in_recognition_order_restores_original_rows(qapp):
+    model = make_model()
+    model.sort(THUMBNAIL_COLUMN, Qt.AscendingOrder)
+    model.removeRowSet([1, 4, 5], '删除')
+    model.undo_stack.undo()
+    assert texts(model) == TEXTS
@@ -0,0 +1,62 @@
+# tests/test_page_image.py
+
+import threading
+
+from PIL import Image
+
+from image_models.page_image import PageImage
+
+
+def make_page(tmp_path):
+    path = tmp_path / 'page.png'
+    Image.new('L', (64, 48), 128).save(path)
+    return str(path), path.read_bytes()
+
+
+def test_release_waits_for_open_readers(tmp_path):
+    path, data = make_page(tmp_path)
+    page = PageImage(path)
+    reader = page.encoded()
+    mapping = page._data
+    page.release()
+    # 映射仍归读取者使用，直到其关闭
+    assert reader.read() == data
+    assert not mapping.closed
+    reader.close()
+    assert mapping.closed
+    assert page._data is None
+    assert page.encoded().read() == data
+
+
+def test_concurrent_release_and_read(tmp_path):
+    path, data = make_page(tmp_path)
+    page = PageImage(path)
+    errors = []
+    stop = threading.Event()
+
+    def read():
+        try:
+            for _ in range(300):
+                with page.encoded() as reader:
+                    assert reader.read() == data
+        except Exception as e:
+            errors.append(e)
+
+    def release():
+        while not stop.is_set():
+            page.release()
+
+    releaser = threading.Thread(target=release)
+    releaser.start()
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    stop.set()
+    releaser.join()
+
+    assert errors == []
+    # 读取者都已关闭，映射随 release() 立即关闭
+    page.release()
+    assert page._data is None
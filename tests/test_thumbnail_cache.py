@@ -0,0 +1,56 @@
+# tests/test_thumbnail_cache.py
+
+from PyQt5.QtGui import QImage
+
+from utils.thumbnail_cache import ThumbnailCache
+
+
+class FakeTable:
+    thumbnails = None
+
+
+class FakeWord:
+    def __init__(self, table, index=0):
+        self.table = table
+        self.index = index
+
+
+class CountingCache(ThumbnailCache):
+    def __init__(self, glyph_size, **kwargs):
+        super().__init__(**kwargs)
+        self.glyph_size = glyph_size
+        self.loads = 0
+
+    def _load(self, word):
+        self.loads += 1
+        image = QImage(*self.glyph_size, QImage.Format_RGB32)
+        image.fill(0)
+        return image
+
+
+def test_small_glyph_is_loaded_once(qapp):
+    cache = CountingCache((30, 30))
+    word = FakeWord(FakeTable())
+    for _ in range(5):
+        image = cache.get(word, (96, 36))
+    assert cache.loads == 1
+    assert len(cache) == 1
+    assert (image.width(), image.height()) == (30, 30)
+
+
+def test_large_glyph_is_scaled_once(qapp):
+    cache = CountingCache((200, 100))
+    word = FakeWord(FakeTable())
+    for _ in range(5):
+        image = cache.get(word, (96, 36))
+    assert cache.loads == 1
+    assert image.height() == 36 and image.width() <= 96
+
+
+def test_budget_evicts_oldest(qapp):
+    cache = CountingCache((100, 100), max_bytes=100 * 100 * 4 * 2)
+    table = FakeTable()
+    for index in range(5):
+        cache.get(FakeWord(table, index))
+    assert len(cache) == 2
+    assert cache.used_bytes <= cache.max_bytes
@@ -0,0 +1,24 @@
+# utils/batch_ocr_thread.py
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from image_models.batch_ocr import BatchOCREngine
+
+
+class BatchOCRThread(QThread):
+    page_signal = pyqtSignal(object)  # 按页序发出 PageResult
+    progress_signal = pyqtSignal(int, int, float)  # 已完成页数、总页数、页/分钟
+    finished_signal = pyqtSignal(list)
+
+    def __init__(self, source, processor, ocr_options, max_workers=4, async_processor=None):
+        super().__init__()
+        self.source = source
+        self.engine = BatchOCREngine(processor, ocr_options, max_workers, async_processor=async_processor)
+
+    def cancel(self):
+        self.engine.cancel()
+
+    def run(self):
+        results = self.engine.run(self.source, on_page=self.page_signal.emit,
+                                  on_progress=self.progress_signal.emit)
+        self.finished_signal.emit(results)
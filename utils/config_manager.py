@@ -2,6 +2,8 @@
 
 from PyQt5.QtCore import QSettings
 
+from image_models.constants import OCR_API_URL, PREPROCESS_STEPS
+
 class ConfigManager:
     def __init__(self, filename="config.ini"):
         self.settings = QSettings(filename, QSettings.IniFormat)
@@ -15,10 +17,33 @@ class ConfigManager:
             "image_size": int(self.settings.value("image_size", 1024)),
             "char_ocr": self.settings.value("char_ocr", True, type=bool),
             "return_position": self.settings.value("return_position", True, type=bool),
-            "return_choices": self.settings.value("return_choices", True, type=bool)
+            "return_choices": self.settings.value("return_choices", True, type=bool),
+            "batch_workers": int(self.settings.value("batch_workers", 4)),
+            "batch_async": self.settings.value("batch_async", False, type=bool),
+            # 异步上传时每秒最多发出的请求数与同时进行的最多请求数，无界面选项
+            "batch_rps": float(self.settings.value("batch_rps", 5.0)),
+            "batch_in_flight": int(self.settings.value("batch_in_flight", 32)),
+            "upload_format": self.settings.value("upload_format", "JPEG"),
+            "upload_quality": int(self.settings.value("upload_quality", 85)),
+            "upload_grayscale": self.settings.value("upload_grayscale", True, type=bool),
+            "api_url": self.settings.value("api_url", OCR_API_URL) or OCR_API_URL,
+            "tile_size": int(self.settings.value("tile_size", 0)),
+            "preprocess_steps": {step: self.settings.value(f"preprocess_{step}", False, type=bool)
+                                 for step in PREPROCESS_STEPS},
+            "screenshot_auto_ocr": self.settings.value("screenshot_auto_ocr", True, type=bool),
+            "screenshot_save": self.settings.value("screenshot_save", True, type=bool),
+            # 缩略图缓存内存上限（MB），无界面选项，直接在 config.ini 中修改
+            "thumbnail_cache_mb": int(self.settings.value("thumbnail_cache_mb", 128)),
+            "log_level": self.settings.value("log_level", "INFO"),
+            # 日志面板保留的最多行数；log_file 为空时不写日志文件
+            "log_buffer_lines": int(self.settings.value("log_buffer_lines", 5000)),
+            "log_file": self.settings.value("log_file", "")
         }
 
-    def save_settings(self, api_token, email, det_mode, image_size, char_ocr, return_position, return_choices):
+    def save_settings(self, api_token, email, det_mode, image_size, char_ocr, return_position, return_choices,
+                      batch_workers=4, upload_format="JPEG", upload_quality=85, upload_grayscale=True,
+                      api_url=OCR_API_URL, tile_size=0, preprocess_steps=None, screenshot_auto_ocr=True,
+                      screenshot_save=True, log_level="INFO", batch_async=False):
         """将设置保存到 config.ini 文件中"""
         self.settings.setValue("api_token", api_token)
         self.settings.setValue("email", email)
@@ -27,3 +52,15 @@ class ConfigManager:
         self.settings.setValue("char_ocr", char_ocr)
         self.settings.setValue("return_position", return_position)
         self.settings.setValue("return_choices", return_choices)
+        self.settings.setValue("batch_workers", batch_workers)
+        self.settings.setValue("upload_format", upload_format)
+        self.settings.setValue("upload_quality", upload_quality)
+        self.settings.setValue("upload_grayscale", upload_grayscale)
+        self.settings.setValue("api_url", api_url)
+        self.settings.setValue("tile_size", tile_size)
+        for step in PREPROCESS_STEPS:
+            self.settings.setValue(f"preprocess_{step}", bool((preprocess_steps or {}).get(step, False)))
+        self.settings.setValue("screenshot_auto_ocr", screenshot_auto_ocr)
+        self.settings.setValue("screenshot_save", screenshot_save)
+        self.settings.setValue("log_level", log_level)
+        self.settings.setValue("batch_async", batch_async)
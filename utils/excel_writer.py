@@ -0,0 +1,96 @@
+# utils/excel_writer.py
+
+import os
+from io import BytesIO
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.drawing.image import Image as ExcelImage
+
+from image_models.ocr_result import export_thumbnail
+
+
+def save_to_excel(data_list, base_path, file_name="ocr_results"):
+    """
+    将OCR结果保存到Excel文件
+    
+    Args:
+        data_list: 包含 (pil_image, character, confidence) 元组的列表
+        base_path: 基础路径
+        file_name: 文件名（不含扩展名）
+    """
+    # 创建输出文件夹
+    output_folder = os.path.join(base_path, "output")
+    os.makedirs(output_folder, exist_ok=True)
+    
+    file_path = os.path.join(output_folder, f"{file_name}.xlsx")
+    write_excel(data_list, file_path)
+
+
+def write_excel(data_list, file_path):
+    """
+    将OCR结果写入指定的Excel文件，文件已存在时追加到末尾
+    
+    Args:
+        data_list: 包含 (pil_image, character, confidence) 元组的列表，pil_image 也可以是PNG字节
+        file_path: xlsx 文件路径
+    """
+    # 检查文件是否存在，决定是加载还是创建
+    if os.path.exists(file_path):
+        wb = load_workbook(file_path)
+        ws = wb.active
+        # 获取下一行的行号
+        start_row = ws.max_row + 1
+    else:
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "OCR Results"
+        # 写入表头
+        ws.append(["Row", "Image", "Character", "Confidence"])
+        # 设置列宽
+        ws.column_dimensions['A'].width = 8
+        ws.column_dimensions['B'].width = 20
+        ws.column_dimensions['C'].width = 15
+        ws.column_dimensions['D'].width = 15
+        start_row = 2  # 从第2行开始（第1行是表头）
+    
+    # 处理每个数据项
+    for index, (pil_image, character, confidence) in enumerate(data_list):
+        current_row = start_row + index
+        
+        # 添加行号和文本数据
+        ws.cell(row=current_row, column=1, value=current_row - 1)  # 行号
+        ws.cell(row=current_row, column=3, value=character)        # 字符
+        ws.cell(row=current_row, column=4, value=confidence)       # 置信度
+        
+        # 处理图片
+        try:
+            if isinstance(pil_image, bytes):
+                # 进程池中已缩放并编码好的PNG字节，直接使用
+                img_buffer = BytesIO(pil_image)
+            else:
+                # 将PIL Image转换为字节流
+                img_buffer = BytesIO()
+                # 确保图片格式兼容，并缩小到适合单个字符的尺寸
+                export_thumbnail(pil_image).save(img_buffer, format='PNG')
+                img_buffer.seek(0)
+            
+            # 创建Excel图片对象
+            excel_img = ExcelImage(img_buffer)
+            excel_img.anchor = f'B{current_row}'  # 锚定到B列对应行
+            
+            # 添加图片到工作表
+            ws.add_image(excel_img)
+            
+            # 调整行高以适应图片
+            ws.row_dimensions[current_row].height = 60
+            
+        except Exception as e:
+            print(f"添加第 {index + 1} 个图片失败: {e}")
+            ws.cell(row=current_row, column=2, value="[图片添加失败]")
+    
+    # 保存文件
+    try:
+        wb.save(file_path)
+        print(f"成功保存 {len(data_list)} 条数据到: {file_path}")
+    except Exception as e:
+        print(f"保存文件失败: {e}")
@@ -3,18 +3,44 @@
 from PyQt5.QtCore import QThread, pyqtSignal
 from image_processor import ImageProcessor
 
+# 每批发送给表格的单字数与批间间隔（毫秒），给界面留出处理输入和重绘的时间；
+# rows_signal 以阻塞式排队连接时，批次不会在界面线程的事件队列中堆积
+ROW_CHUNK_SIZE = 500
+ROW_CHUNK_INTERVAL_MS = 10
+
 
 class ImageProcessingThread(QThread):
-    finished_signal = pyqtSignal(object, list)
+    page_signal = pyqtSignal(object)  # 解析出框坐标后立即发出 OCRPage，供叠加检测框
+    rows_signal = pyqtSignal(object)  # 按批发出 OCRWord 列表
+    progress_signal = pyqtSignal(int, int)  # 已发出单字数、总数
+    finished_signal = pyqtSignal(object)
 
-    def __init__(self, image_path, ocr_data):
+    def __init__(self, image, ocr_data, chunk_size=ROW_CHUNK_SIZE):
         super().__init__()
-        self.image_path = image_path
+        # 图像路径或 OCR 时用过的 PageImage
+        self.image = image
         self.ocr_data = ocr_data
+        self.chunk_size = chunk_size
+
+    def cancel(self):
+        """停止发送剩余的行，已发出的保留"""
+        self.requestInterruption()
 
     def run(self):
-        processor = ImageProcessor(self.image_path, self.ocr_data)
-        boxed_image, words_data = processor.process_image()
+        processor = ImageProcessor(self.image, self.ocr_data)
+        page = processor.process_image()
+        self.page_signal.emit(page)
+
+        words = page.words if page is not None else None
+        total = len(words) if words is not None else 0
+        for start in range(0, total, self.chunk_size):
+            if self.isInterruptionRequested():
+                break
+            end = min(total, start + self.chunk_size)
+            self.rows_signal.emit([words[index] for index in range(start, end)])
+            self.progress_signal.emit(end, total)
+            if end < total:
+                self.msleep(ROW_CHUNK_INTERVAL_MS)
 
-        # 直接发送boxed_image作为PIL图像对象
-        self.finished_signal.emit(boxed_image, words_data)
+        # 发送整页识别结果 OCRPage
+        self.finished_signal.emit(page)
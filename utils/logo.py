@@ -1,9 +1,18 @@
 import base64
-from PyQt5.QtGui import QPixmap
+import os
+from PyQt5.QtGui import QIcon, QPixmap
+
+LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'icons', 'ancient-text-ocr-logo.png')
 
 def get_logo_pixmap():
     base64_str = "iVBORw0KGgoAAAANSUhEUgAAAQAAAAEACAYAAABccqhmAAAAAXNSR0IArs4c6QAAHcJJREFUeF7tnQmYTuXfx78zGFtk35oU8topJclSCBMVEmWJoviTUt5WLYoWqVeJ+IesFdllN/axVcjOGDO2sWfJPtPgve4zzTQznpnnPvdznuc55z7fc11dFffy+31+9/k+935CLowpdAN8SIAEXEkghALgyrjTaRIwCFAA2BBIwMUEKAAuDj5dJwEKANsACbiYAAXAxcGn6yRAAWAbIAEXE6AAuDj4dJ0EvApAnYkNSIkESMChBNZ3Xp2l5RQAhwaWZpOADAEKgAwlpiEBTQlQADQNLN0iARkCFAAZSkxDApoSoABoGli6RQIyBCgAMpSYhgQ0JUAB0DSwdIsEZAhQAGQoMQ0JaEqAAqBpYOkWCcgQoADIUGIaEtCUAAVA08DSLRKQIUABkKHENCSgKQEKgKaBpVskIEOAAiBDiWlIQFMCFABNA0u3SECGAAVAhhLTkICmBCgAmgaWbpGADAEKgAwlpiEBTQlQADQNLN0iARkCFAAZSkxDApoSoABoGli6RQIyBCgAMpSYhgQ0JUAB0DSwdIsEZAhQAGQoMQ0JaEqAAqBpYOkWCcgQoADIUGIaEtCUAAVA08DSLRKQIUABkKHENCSgKQEKgKaBpVskIEOAAiBDiWlIQFMCFABNA0u3SECGAAVAhhLTkICmBCgAmgaWbpGADAEKgAwlpiEBTQlQADQNLN0iARkCFAAZSkxDApoSoABoGli6RQIyBCgAMpSYhgQ0JUAB0DSwdIsEZAhQAGQoMQ0JaEqAAqBpYOkWCcgQoADIUGIaEtCUAAVA08DSLRKQIUABkKHENCSgKQEKgKaBpVskIEOAAiBDiWlIQFMCFABNA0u3SECGAAVAhhLTkICmBCgAmgaWbpGADAEKgAwlpiEBTQlQADQNLN0iARkCFAAZSkxDApoSoABoGli6RQIyBCgAMpQ0SNPz+adRo2olHD1+0vgnJvYAfv9jBy5fuaqBd3RBlQAFQJWcg/LlyZ0LA/u9gprVKyMkJCTV8hs3bhgCcOToCeyNPYCoDZvw66ZtDvKMpvpKgALgK0GH5C9auCDeea0H7qlWMZ0IZDT/ytUExO4/hMiV64x/2ENwSIAVzaQAKIJzYrY7S9+G91/viXJ33i5l/qXLV7Bxy07MmheJLTv2SOVhImcRoAA4K14+W1v73up4vXdXiB6B7PP330nYtisa3/8wA7uiY2WzMZ0DCFAAHBAkq0184tGG6N65HW7Jm8dU0YmJf2PNhs0YOW4yTp0+ayovE9uTAAXAnnHxu1V9enRGy0cbIjQ01FRdYuLw2IlTGDd5FiJXrDOVl4ntR4ACYL+YBMSizFYGZCsXk4Mz5kbi+x+my2ZhOhsSoADYMCiBMkllPiCtbWJuYPGKNfhy+LhAmcx6LCZAAbAYqNOKe659a3Ro0wJhYTmUTBfzAlPnLMKYSewJKAEMciYKQJADYIfqv/joDdx3d5Us9wdkZefFS5cxauJU/LJwhR3coQ0mCFAATMDSNWn9B+7D//bqggIF8iu7uG//YXw4eDjijxxXLoMZA0+AAhB45rasUXVVIMWZpKRrmDZnEb6bMNWW/tEozwQoAGwZBgGxS/Djfn0QXqq4MpGYuIPo886n3D6sTDDwGSkAgWdu2xq7dngS7du0QI4c2ZVsFFuHh43+EYuWRSnlZ6bAE6AABJ65bWsMv60EBrzdG2XvkDsrkNGRa9euYcbcJRgxdoptfaRh6QlQANgi0hHo0aUd2raMQPbs2ZTIzI9chS+GjVXKazaT2NIc0ag+fpw+D2t/3Ww2O9MDoACwGaQjULlCOXzw5ksoUbSwEplACUDaOYvzFy5hwpRZxs5EPuYIUADM8XJFanFkuFH92qb3BVy/fgNzFi7H0O8m+pWTp23MiYmJmLdkFb4Z9YNf69atcAqAbhG1wJ9WzRujx3NPI3eunKZKu5qQYCwDzpq31FQ+s4l7dWuPJ1s0uWmYcv36dURt2IzPh47mSoQkVAqAJCg3JROTgZ9/0Be3lTS3JHg4/hje+eRrv24G8naUWZxWjN53AN+MmsS7CyQaLQVAApIbk3zyXh/Uvb+mtOviTMBPM+Zj/ORZ0nnMJjSzV+HIsRPGagQnB7OmTAEw2wpdkr5bp6fwTOtHpfYEiF9dcXVY/0HD/Nb1Vjm+zMlB742VAuCdkStTiNWAbp3a4O6qFZEtW+ZLgmLtX4y7B38zxm8vvwjAi8+2RbtWEVKClDZgnBxkD8CVL7BVTouDQu3bNMddZUqnOzIsXvyD8Ucx45dIiKU/fz7exv3e6g6USHmzw45/zx6AHaNiU5tqVq+EIoULISEhIWAfFRHj/v5v9kKZ0uE+URHDlG07o/HVfyfiwKEjPpWlU2YKgE7R1MwXlXF/VgiECMQeiMeQEeO4QvAPKAqAjy/NA7VqoHO7lsiZM8zHkpg9I4Hs2bKhVIlipsf93kjGHz2BYaN/4FeQuBXYW1Px/vcVy5fBh2/1RoliRbwnZgrbEBDXmn/934muXyZkD8CCJjlk4FuoWaOyBSWxiEAREKsD46fMxk/T5weqSlvWQwGwICwvPPsUWj7aKMvlMl+qCQ0NQc6wMGNvvmi4Sdeu+1JcUPKm9cEXA6zw//Tps1iwLAqTZ7j75RdxoAD40hoDlLda5Qr44I2exue81v62Ge9+PDRANVtXTevHHoE4apwrp7nzBWktENeQT5m1kN8isC4sFAALWfq1qLHDPjYu6hBbXN8aMMSv++394Uivrs+gzeNNfeoliZ19YgZ/5drf/WGiK8tkD8AhYU/Zmy8+3/3d+J8xe8Eyh1iebKbZswWenHOq+Nk5UBQAO0cnjW0pv6DiW34Ll0Vh8DffO8TyZDNHfzUA5cvd4ZPNv/+xA2/0/8KnMpg5PQEKgENaRETj+nj5xY7Imyc39h+Kx0tvDPTr3nsrsaSdw1Atl/cNqpLLOh8FwD9cLS817X4Dp92+a8UEoPB5yMgJWLZqveVs3VwgBcBB0R/++XuoWqk8xJbW5VG/YuCXIx1hffJHRxpBLAWqPhz/q5JjD8A/5IJQ6usvPY8WTR8y9gME4vYdq1y0YqOUU5c/rWLor3LYA/AXWT+Um7YrLW7gmfDzbPw4bZ4farKuSNXrxdJaINb/xaadsT/NtM4wlmQQoAA4qCFknEzbvHUX+r7/ua09SDt5qWron2fO4NMho7B5227VIpgvEwIUAIc1jZR5AGH22XN/YdDQMbY+1WbF+H/H7hj0futjh0XKGeZSAJwRp1Qr075Q4h7+eYtXYsjI8bb1Iq1gqRjJ5T8VavJ5KADyrGyRMmOX+vip0xgw+FtbXnAhbhDq17c7ihQqpMzu3LnzGDxsLNb9/odyGcyYOQEKgMNaR8ZJtaSka5g2Z5HxQQ67PR3bPoYuT7dKd5egWRvZ/TdLzFx6CoA5XrZInXFfvV2XBAe93xfixiTVh91/VXLy+SgA8qxsk7L9ky3wfAfxy5p8DZkdl8msuCnJCZOctmkUioZQABTBBTObpy/4xh08jA8GDbfNMWEruv/bd0Xj5bc/DSZq7eumADg0xBl319mtF+Br998pG50c2nxSzaYAODSCXTs8ifZtWqS7MVfcdvvep0ODfu+9px6KWczHT/6JDz8fjj0x+81mZXoTBCgAJmDZKamnJTbxeew5C1dg6HcTg2qquPqrbcuImz7fLWuU0w47yfplx3QUADtGRdImT91sO2yb9XXzz4WLl/D1d5N49FeyHfiSjALgC70g5/U00SZ+Pddv3IJ+A78OinWNH6qDV3s8i3y35FWun5N/yuhMZ6QAmEZmnwyZnbS7mpCA0ROnYcbcyIAb+/7rPdGofm3jyLLKw8k/FWrqeSgA6uxskTOzF05cG/bR4BEBnRC0YvLPbsuZtgiyH42gAPgRbiCKzqzLLSYEI1etw2dfjQ6EGUYdvbq1x5MtmihP/tl5W3PAIAa4IgpAgIH7o7phg/pB3BWQ8RH36I2aMBVzFi73R7XpyhTDkc/efRW3h5dUruvYiVPGNWe7omOVy2BGcwQoAOZ42TJ1VrvuArU3wNedf0442mzL4PtoFAXAR4B2yJ7Vr69YFdi8bRfe//Qbv10jnid3Lgz9rB/Kl1W/99/Ox5rtEGN/2UAB8BfZAJfbt+dzeKzZwx5v3hUz61PnLMKYSdP9YlWHp1rguWf+PZxkthL++pslZl16CoB1LINakrfLNy5euoxRE6fil4UrLLVT/Pp/9cnbqHBXGeVyOfZXRudzRgqAzwjtU4C3NfhTp8/iy+FjLb1D0Nexv5j5nzk/EiO+n2wfkC6yhAKgUbBr31sdb/d5AQUL3OrRK6vnA8Tcw4C3extfLVZ9uO6vSs6afBQAazjaphRvvQAhAhu37ET/QcN8nhT0dd0/MTER46fMxk/T59uGn9sMoQBoFnFvvQDhrhWbhMSuPyE2JYsXVSYo7vl/75OvfRYiZQOYkR8G0bENeOsFCJ99XRno/+ZLeLhuLeU9/+K23/8bMQFRGzbqGALH+MQegGNCJW+otxWBlJJEF3zKrEUY++MM+cIBNH+kAXp2fUb5xJ9d7i0w5bSmiSkAmgY2+QMiDREaGpqlh2K78A9T52LyTLlxuBXLfvv2H8aHg+1zf6GmTUDKLQqAFCbnJbqz9G34uF8fhJcq7tV4MyIgKyyZVSou+xg5dgoWLF3t1S4m8D8BCoD/GQetBjM79C5fuYqpsxdi/OTZmdrbqEFtvNqjC/LnU7vsg13/oDWFTCumANgvJpZZJLrrH7/7KsScgMwj5gTEJSKevjJkRdd/+64YvPXRl5z1lwlGgNJQAAIEOljVmP3VFteLL16xBl8OH5fO5HdeexFNHnrQ65xCZn76YxdisJjqVC8FQKdoZuKL2XG76KpHbdiMz4eONn6tWz7aCN27tEPePLmVaHHDjxK2gGSiAAQEc3ArEVt2P3yzN+4qI79lV+wYjN53ADPmLUH3zu1QtHBBJSes2HSkVDEzSRGgAEhhcn4i1bV78YHObNmyKQGw+uyBkhHMlCUBCoCLGsibr3RDRKN6yuN4s6hiDxw2rvg6cOiI2axMHyACFIAAgbZDNWIm//P+r6Na5fJ+N4eTfn5HbEkFFABLMDqnEHFY6PXeXZXH9DKe+uvyEZm6mcYcAQqAOV5apDazQcisw+LlH/fTzKB8lMSsrUwPngZ0ayPwdV3fEzdfTxi6NRbB9Js9gGDSD2LdYj5gYL9XULN6ZeUjvWnN58sfxGD6UDUFwAd4Ts8qDgyJuwPK3Sm/PyAzn8+e+wtjJs3A/MhVTsfiKvspAK4K983ORjSuj5df7Ki8yy9tiWLPwM49Mfhh2jz8tnm7y8k6w30KgDPi5Bcr765aEa/17II7bi9lafliOLBmw2aMHDcZYjmQj30JUADsGxu/WiaWA19+sZPUfQGqhoiz/5Er1xkfJBFnCvjYjwAFwH4x8btFTRo+iB5d2qFIIbX9/WYMFNuBz547j9kLlmL6L0soBGbgBSAtBSAAkO1URZvHm6DLM62VL/VQ9YVCoErOv/koAP7la6vSu3V6CkIAxBJgsJ4UIViyYi1mzF3COYJgBeKfeikAQQ5AIKoXL3zvFzsaF3rkyJE9EFVK1SHuItzw+xZMmjaXB4akiFmfiAJgPVNblSjW+l/7T2dUr1LBkg0//nBO3EIkTg7OnBcJ0TPgEzgCFIDAsQ54TXVr10Svrs/gtpLebwbOaJzoqu/eG2e8kJ3aPR6wCcMTf57BqjW/YuGyNewVBKDFUAACADkYVXR++gm0bRmh9PEOsWS3aFlU6vJdIJYMMzJK6RXMW7wC85Zwd6G/2hAFwF9kg1SuuLrr5e6dUPf+e0zf5CN+9Y8cO4mR46Zg7a+b03kghhJvvfICKpYvE/ChhJgr2LJjNxYtXctPiVncrigAFgMNZnFiff/59q2ND3aGhISYMkVc3Dk/MgqjJ07NdK1eTCa++coLqP9ATdPiYsqYTBILgfrrwkVs3xWNJcvXUwwsgEoBsABisIsQL+aLnduhRZP6CAsLM2WOeKn2xR3C6EnTpPfv22U5Udw9sCdmPxYtX4Nlq9ab8puJkwlQABzeEu6vWQ29urY39vOb/dUXX+j9ec4iTJ4h913AtKh8mWD0B/IrVxNwOP4YNm7ZiSUr13ICURIyBUASlN2SiV/9vj2fQ4MH70NYWA5T5ll1WEfMN4jrxe67u0pQhgSZOS2uIv/r/AXs2huL3zZtN84j8CyCZ1oUAFOvjj0St2jyEDq2fcz0WN9fx3Xbt2mBp1s/igL589kDUAYrhN9nzp3H3tj92LRlF6LWb+QOxH8YUQBs2WQ9G1W5Qjl069QG4hivmbv6xTg/9kC88fFPf220Ebb957l2qFbZvhuOUqgKHhcuXsbR4yexY08Mfp65wLWCQAFwgACIrrb4Ok/dB2qa2scvGvqBw0cwfc6SgN3UY/QGWkagQIH8DiAL48Uf8MVIY2XBjQ8FwMZRF+P8jk89jhZNGph6oVJe/DkLlmP2gmUB99CucwMpIBISEnHsxCnExB7Ehs3bXL2CQAEI+OshV6H4JW3d4hHj/n7Z2X0x1o2JO2SbPfVNG9ZFu1aPotyd4dI+yNExn0pMDB6KP4bFK9ZizoJlnBTkHID5RhSIHOKFad28MUoULyL90ohftC079hjLeeLfdnuCOSwQvSHxa//jtHkBGwbZjX9W9rAHYJNoiRe/VfNG0jP7TjtXL3oyHZ56HE0bPmjJBaQyYRPnCSJXrcPw0T/yFz8TYBQAmZbkpzRijP/UE03xWLOG0l198WsvZq4XLI1y5NhVdULTbAjE+YEfps7F5JnmNzmZrcvJ6SkAQYieeAm6tG+Feg/cK7V2njJ+XfvrH8bdejrctCsOFz3b9nHUuf8eUysbMuHiyy9DKTkNBUCelc8pxbZdsWGmasXyyJkz6z374qU/+ecZbNi41ZjJ1/UT20IMu3Z6EvVq36t0dDljUPiFInPNlAJgjpfp1KKb37J5YzRrWBelw0siNDQ00zLELP7RYyfxx/Y9WLB0lXHQxS2PEII2jzeFWDkoWCC/9ARoWj5iXmT9xi3oN/Brt2Dz2U8KgM8IPRcgduu1fqyJsU8+b57cmdYiDrHsPxiPqPWbsHTVOi26974ibdW8MVo2b4Q7wktlKZgZ6xGz/QO/HIld0bG+muCa/BQAC0Od8iv2cL37UaxIIY+NV/zKnzpzDtt3RGPNr5uwat1GCy3QqyhZERVeixl/sQw69qeZekHwszcUAB8Biy7+Y00fRuOHHkCZ0uE3ncxLexCFJ9PUYMsMo2LiDqLPO59yuc8kYgqASWBpkzd/pAG6P9cudSZfjEGvJiTixMk/jW2mm7buxOr1G9kofWCcMatYPWjbshlq3VMtdek0Kekaps1ZhO8mTLWwJncURQHwIc7il+ndvj0QGhKKHdEx2LRlp6sm7nxAZ0lWcVmp+LqxuALtm1GTOPZXoEoBUIDGLCSgCwEKgC6RpB8koECAAqAAjVlIQBcCFABdIkk/SECBAAVAARqzkIAuBCgAukSSfpCAAgEKgAI0ZiEBXQhQAHSJJP0gAQUCFAAFaMxCAroQoADoEkn6QQIKBCgACtCYhQR0IUAB0CWS9IMEFAhQABSgMQsJ6EKAAqBLJOkHCSgQoAAoQGMWEtCFAAVAl0jSDxJQIEABUIDGLCSgCwEKgC6RpB8koECAAqAAjVlIQBcCFABdIkk/SECBAAVAARqzkIAuBCgAukSSfpCAAgEKgAI0ZiEBXQhQAHSJJP0gAQUCFAAFaMxCAroQoADoEkn6QQIKBCgACtCYhQR0IUAB0CWS9IMEFAhQABSgMQsJ6ELANQLQrcZBXWJGPxxA4PutdzjASsA1AuDNUUdEi0Y6hkCdiQ0cYau39yLkwphCN7LyRBdHHREtGukYArq8F9oIAIcAjnl3tDCUQwAtwkgnSEBvAq4ZAugdRnpHAmoEKABq3JiLBLQgQAHQIox0ggTUCFAA1LgxFwloQYACoEUY6QQJqBGgAKhxYy4S0IIABUCLMNIJElAjQAFQ42a7XLfnv4Lnqx9ErZLnUCBnErKHXseNG8D5xBzYeSo/Ju4Ix7ZTtxp/ltUTEgLUCz+DDpUPo3zBi8gbds1Inng9FCcu5sT82BKYtbcEzifkuKmYYU224b6S57IsX5Rz5nIYlh4oivE7SuNSYjbbsXSTQRQAh0c7Z7br6H1fHFqVP2689Jk94sUXAvD+6ko4dTnMY7LwfFfRv94eVClyHkIIMnuuJGXD0N/LYk5MyXRJZAQgbYZ9Z/OiT2R1nLl6s5g4PCyOMZ8C4JhQ3WyoePnfrxuNRnecyvKFTZvzyMXceH1ZFRz4K0+6Au8qeAlfNNqBEnkTpIhc/jsb+kdVxJr4wqnpzQqAyLhgX3EMXFdBqk4msp4ABcB6pgErsU2Fo3i1VlzqL//VpFDM3lsSP+8Ox/FLOSEEom74GfSsGQfx657yrD9SCO+srIyEa6HGH4WFXsegRrtQp9QZ4/9Fb2H36XwYsbkstpzIj+sIQfkCF9H9noOoc9sZhIYkjyOiz9yCl5bUSO3GpxWAjccK4OXI6ulYZAu5gYiyJ/HKfXHIn/Nv4+9OXMqJnotq4NilXAHjxor+JUABcGhrKJTrb/w3YgvE2F88nn6RU1wTaYc22QbxKy8e8eJ/EFUJqw8l/3o3KH0aA+rvNgRDPBkFIqUcMSx4r040apQ4j8VxxbBgXzGIHkXK400AUtK9XScGLcsfM/733NUwdF9UA4fP/1uOQ0PiSLMpAI4MG4xu/4f1opHjn5fWW1e6ZvG/jC5+nhzJk3qL4orjozXJXe/+9aIRUfaE8d8XE7Ojz9Jq2PVnPtNkZAUgbX0UANOYLc1AAbAUZ+AK+889+9Gl2uHkX/SkULy7uhLWphmPZ7QkX1gSRjTbmtoLEBNwvRbXQNL1EHzbbCsqFb5oZEn58wuJ2U07400Acme/hohyJ9C75v5UIco4jDBdKTP4RIAC4BO+4GVW6UanfUFTxt5XroViZLNtuPPWy4Yznsbusl6anQRMuh6Kr38vixnRpWSrYDqLCVAALAYaqOLSvmyy3WhPeYS9oyK2okCuxIAKgNgPMH5baYzfXtrr3oRAMXVjPRQAh0ZdZRztqQeQdCMUIyO24rZbkicT/d0DEBuIJu64HXP3Ffe4mcih4XCs2RQAh4bu1VqxeLrSEek5gFtz/o0RzbahbIHklYCUsb74b09zA1bNAYhx/7NVD6Nj1XhjuVE8me1FcGgoHG02BcCh4cu4CrAwrhgGrq2YaXc641JfZqsAYjnxjeVVsfnErabJZDUJKMSq9737U/cscBegabx+yUAB8AtW/xfqaR/AgLUVseqftf20Fli5D6BvrX3GvoHVhwtj7t4SiDl3S6roZCUAYo/BZw/vMjYSpTxi1aLfykrGOQM+wSFAAQgOd0tq7VglHj1r7ofYYSce8SItiSuG8dtuN7rZovvd+M5T6HHPARTJnTzJJ57fjhXEm8urpO4EFC/n0CbbUaPYX8bfi52AO//Mj69+K4fdZ5L3A3jaCRh/IRd6L6lh7OYTj7dlwFL5ruDbpttStxuLVYBB68tjfmxxS3iwEPMEKADmmdkmh8pZALFFWHTxRRc87WP2LICnJTxvAiDqy7h9OaOI2AauSwyhADg80MZpwHvj8MT/HE+dZPPkUsqv+kdrKkK8dJ4ecV7gs4d3pm4WygyNOA04bFMZzN5bKt2cg4wAiInATx/ejbrhp1OLnxVdCl/8dheXA4PQFikAQYDujyqL501AhyrxqH/7aRTNnXjTfQDTo0tiw9FCXl8yMZwQY/x2FY+gYuELyJU9eeY+5T6AyAPFMH1PKZz1cIRXRgBEWaK3MaTxdhTNkzwsEROP766qjA1HC/oDDcvMggAFgM2DBFxMgALg4uDTdRKgALANkICLCVAAXBx8uk4CFAC2ARJwMQEKgIuDT9dJgALANkACLiZAAXBx8Ok6CVAA2AZIwMUEKAAuDj5dJwEKANsACbiYAAXAxcGn6yRAAWAbIAEXE6AAuDj4dJ0EKABsAyTgYgI+C4CL2dF1EtCeQMiFMYWSL5zjQwIk4DoCFADXhZwOk8C/BCgAbA0k4GICFAAXB5+ukwAFgG2ABFxMgALg4uDTdRKgALANkICLCfw/3+/B4vna9rcAAAAASUVORK5CYII="
     image_bytes = base64.b64decode(base64_str)
     pixmap = QPixmap()
     pixmap.loadFromData(image_bytes)
-    return pixmap
\ No newline at end of file
+    return pixmap
+
+def get_logo_icon():
+    """窗口图标：优先由 QIcon 按需加载 icons 下的文件，避免启动时解码内嵌的 base64 图片"""
+    if os.path.exists(LOGO_PATH):
+        return QIcon(LOGO_PATH)
+    return QIcon(get_logo_pixmap())
@@ -1,15 +1,163 @@
 # logs.py
+"""
+基于 logging 的日志面板
 
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTextEdit
+任何线程都可以调用 LogBox.log 或直接使用 logging.getLogger('yingwen.xxx')；
+记录先进入有界的待显示队列，再按 FLUSH_INTERVAL_MS 合并成一次追加送到界面线程，
+工作线程不再直接操作控件。面板只保留最近 capacity 行，可选写入滚动日志文件。
+"""
+
+import logging
+import logging.handlers
+import threading
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QComboBox, QLabel
+
+LOGGER_NAME = 'yingwen'
+LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+DEFAULT_CAPACITY = 5000
+# 界面合并刷新的间隔（毫秒）
+FLUSH_INTERVAL_MS = 100
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+class _Notifier(QObject):
+    # 待显示队列由空变为非空时发出，跨线程自动排队到界面线程
+    pending = pyqtSignal()
+
+
+class QueuedLogHandler(logging.Handler):
+    """把格式化后的记录放入有界队列，由界面线程取走；队列满时丢弃最旧的并计数"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, level=logging.INFO):
+        super().__init__(level)
+        self.setFormatter(logging.Formatter('%(message)s'))
+        self.notifier = _Notifier()
+        self._pending = deque(maxlen=capacity)
+        self._dropped = 0
+        self._pending_lock = threading.Lock()
+
+    def setCapacity(self, capacity):
+        with self._pending_lock:
+            self._pending = deque(self._pending, maxlen=capacity)
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._pending_lock:
+            was_empty = not self._pending
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append(line)
+        if was_empty:
+            self.notifier.pending.emit()
+
+    def take(self):
+        """取走全部待显示的行与期间丢弃的行数"""
+        with self._pending_lock:
+            lines = list(self._pending)
+            self._pending.clear()
+            dropped, self._dropped = self._dropped, 0
+        return lines, dropped
 
 
 class LogBox(QWidget):
-    def __init__(self):
+    def __init__(self, capacity=DEFAULT_CAPACITY, level=logging.INFO):
         super().__init__()
         self.layout = QVBoxLayout(self)
-        self.log_text_edit = QTextEdit(self)
+        level_layout = QHBoxLayout()
+        level_layout.addWidget(QLabel('日志级别:'))
+        self.level_combo = QComboBox(self)
+        self.level_combo.addItems(LEVELS)
+        level_layout.addWidget(self.level_combo)
+        level_layout.addStretch()
+        self.layout.addLayout(level_layout)
+        self.log_text_edit = QPlainTextEdit(self)
         self.log_text_edit.setReadOnly(True)
+        self.log_text_edit.setMaximumBlockCount(capacity)
         self.layout.addWidget(self.log_text_edit)
 
-    def log(self, message):
-        self.log_text_edit.append(message)
+        self.logger = logger
+        self.handler = QueuedLogHandler(capacity, level)
+        self.handler.notifier.pending.connect(self._scheduleFlush)
+        self.logger.addHandler(self.handler)
+        # 根 logger 没有输出时，logging 会把 WARNING 以上的记录另外打印到标准错误
+        self.logger.propagate = False
+        self.file_handler = None
+        self._flush_scheduled = False
+
+        self.level_combo.setCurrentText(logging.getLevelName(level))
+        self.level_combo.currentTextChanged.connect(self.setLevel)
+        self.setLevel(self.level_combo.currentText())
+
+    def log(self, message, level=logging.INFO):
+        """可在任意线程调用"""
+        self.logger.log(level, message)
+
+    def debug(self, message, *args):
+        """调试日志：级别未开启时不格式化参数，几乎没有开销"""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args)
+
+    def setLevel(self, level):
+        """设置面板显示的最低级别；logger 的级别取各输出中最低者，未开启的级别直接跳过"""
+        if isinstance(level, str):
+            level = logging.getLevelName(level.upper())
+        self.handler.setLevel(level)
+        levels = [self.handler.level]
+        if self.file_handler is not None:
+            levels.append(self.file_handler.level)
+        self.logger.setLevel(min(levels))
+        if self.level_combo.currentText() != logging.getLevelName(level):
+            self.level_combo.setCurrentText(logging.getLevelName(level))
+
+    def level(self):
+        return self.level_combo.currentText()
+
+    def configure(self, level='INFO', capacity=DEFAULT_CAPACITY, file_path=None, file_level=logging.DEBUG):
+        """
+        Args:
+            level: 面板显示的最低级别
+            capacity: 面板与待显示队列保留的最多行数
+            file_path: 滚动日志文件路径，为空时不写文件
+            file_level: 写入文件的最低级别
+        """
+        self.handler.setCapacity(capacity)
+        self.log_text_edit.setMaximumBlockCount(capacity)
+        if self.file_handler is not None:
+            self.logger.removeHandler(self.file_handler)
+            self.file_handler.close()
+            self.file_handler = None
+        if file_path:
+            try:
+                self.file_handler = logging.handlers.RotatingFileHandler(
+                    file_path, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding='utf-8')
+            except OSError as e:
+                self.log(f'无法打开日志文件 {file_path}：{e}', logging.WARNING)
+            else:
+                self.file_handler.setLevel(file_level)
+                self.file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+                self.logger.addHandler(self.file_handler)
+        self.setLevel(level)
+
+    def _scheduleFlush(self):
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(FLUSH_INTERVAL_MS, self.flush)
+
+    def flush(self):
+        """把积累的日志合并为一次追加显示"""
+        self._flush_scheduled = False
+        lines, dropped = self.handler.take()
+        if dropped:
+            lines.insert(0, f'……省略 {dropped} 条日志')
+        if lines:
+            self.log_text_edit.appendPlainText('\n'.join(lines))
@@ -0,0 +1,229 @@
+# utils/mock_ocr_server.py
+"""
+本地模拟 OCR 服务，协议与看典古籍 /ocr_api 相同，用于离线联调与压测
+
+    python -m utils.mock_ocr_server --port 14141 --latency lognormal:-1.2,0.5 --error-rate 0.02 --rate-limit 20
+
+然后把配置中的 api_url 改为 http://127.0.0.1:14141/ocr_api
+"""
+
+import argparse
+import base64
+import binascii
+import io
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from PIL import Image
+
+# 常见古籍用字，生成的文本只求“看起来像”
+CHAR_POOL = ('天地玄黄宇宙洪荒日月盈昃辰宿列张寒来暑往秋收冬藏闰余成岁律吕调阳云腾致雨露结为霜'
+             '金生丽水玉出昆冈剑号巨阙珠称夜光果珍李柰菜重芥姜海咸河淡鳞潜羽翔龙师火帝鸟官人皇'
+             '子曰学而时习之不亦说乎有朋自远方来乐人知愠君道仁义礼智信也者矣焉哉')
+
+
+class LatencyModel:
+    """响应延迟分布：fixed:秒 | uniform:最小,最大 | normal:均值,标准差 | lognormal:mu,sigma"""
+
+    def __init__(self, spec='fixed:0', rng=None):
+        self.rng = rng or random.Random()
+        kind, _, args = spec.partition(':')
+        self.kind = kind
+        self.args = [float(value) for value in args.split(',') if value] or [0.0]
+        if kind not in ('fixed', 'uniform', 'normal', 'lognormal'):
+            raise ValueError(f'未知的延迟分布: {spec}')
+
+    def sample(self):
+        if self.kind == 'fixed':
+            return self.args[0]
+        if self.kind == 'uniform':
+            return self.rng.uniform(self.args[0], self.args[1])
+        if self.kind == 'normal':
+            return max(0.0, self.rng.gauss(self.args[0], self.args[1]))
+        return self.rng.lognormvariate(self.args[0], self.args[1])
+
+
+class Throttle:
+    """令牌桶 + 并发上限，超出时返回 429"""
+
+    def __init__(self, rate=0.0, max_concurrent=0):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_enter(self):
+        with self._lock:
+            if self.max_concurrent and self.in_flight >= self.max_concurrent:
+                return False
+            if self.rate:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens < 1:
+                    return False
+                self.tokens -= 1
+            self.in_flight += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+
+def build_response(width, height, image_size, det_mode, rng, return_choices=True):
+    """按上传图像尺寸生成与真实接口同结构的 data.text_lines / words / texts"""
+    # 真实接口按 image_size 缩放后识别，坐标基于缩放后的宽高
+    scale = min(1.0, image_size / max(width, height))
+    ocr_width, ocr_height = max(1, round(width * scale)), max(1, round(height * scale))
+
+    vertical = det_mode != 'hp'
+    cell = max(8, min(ocr_width, ocr_height) // 16)
+    margin = cell
+    line_count = max(1, ((ocr_width if vertical else ocr_height) - 2 * margin) // (cell + cell // 4))
+    chars_per_line = max(1, ((ocr_height if vertical else ocr_width) - 2 * margin) // cell)
+
+    text_lines, texts = [], []
+    for line_index in range(line_count):
+        offset = margin + line_index * (cell + cell // 4)
+        words = []
+        for char_index in range(rng.randint(max(1, chars_per_line // 2), chars_per_line)):
+            along = margin + char_index * cell
+            if vertical:
+                # 竖排从右往左
+                x1 = ocr_width - offset - cell
+                y1 = along
+            else:
+                x1, y1 = along, offset
+            char = rng.choice(CHAR_POOL)
+            confidence = round(rng.uniform(0.55, 1.0), 4)
+            word = {
+                'text': char,
+                'confidence': confidence,
+                'position': [x1, y1, x1 + cell, y1 + cell],
+            }
+            if return_choices:
+                word['choices'] = [{'text': char, 'confidence': confidence}] + [
+                    {'text': rng.choice(CHAR_POOL), 'confidence': round(rng.uniform(0, 1 - confidence), 4)}
+                    for _ in range(2)]
+            words.append(word)
+
+        first, last = words[0]['position'], words[-1]['position']
+        x1, y1, x3, y3 = first[0], first[1], last[2], last[3]
+        text = ''.join(word['text'] for word in words)
+        text_lines.append({
+            'text': text,
+            'confidence': round(sum(word['confidence'] for word in words) / len(words), 4),
+            'position': [[x1, y1], [x3, y1], [x3, y3], [x1, y3]],
+            'words': words,
+        })
+        texts.append(text)
+
+    return {'msg': '成功', 'data': {'width': ocr_width, 'height': ocr_height,
+                                     'text_lines': text_lines, 'texts': texts}}
+
+
+class MockOCRHandler(BaseHTTPRequestHandler):
+    server_version = 'MockOCR/1.0'
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        config = self.server.config
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+
+        if self.path.split('?')[0] != '/ocr_api':
+            self._send_json(404, {'msg': 'not found'})
+            return
+        if not config.throttle.try_enter():
+            self._send_json(429, {'msg': '请求过于频繁'})
+            return
+
+        try:
+            time.sleep(config.latency.sample())
+            if config.rng.random() < config.error_rate:
+                self._send_json(500, {'msg': '模拟服务器错误'})
+                return
+
+            form = parse_qs(body.decode('ascii', errors='replace'))
+            try:
+                image = Image.open(io.BytesIO(base64.b64decode(form['image'][0])))
+                width, height = image.size
+            except (KeyError, binascii.Error, OSError):
+                self._send_json(400, {'msg': '无效的图像数据'})
+                return
+
+            def field(name, default):
+                return form.get(name, [default])[0]
+
+            response = build_response(width, height, int(field('image_size', '1024')), field('det_mode', 'auto'),
+                                      config.rng, field('return_choices', 'True') == 'True')
+            self._send_json(200, response)
+        finally:
+            config.throttle.leave()
+
+    def log_message(self, format, *args):
+        if self.server.config.verbose:
+            super().log_message(format, *args)
+
+
+class MockServerConfig:
+    def __init__(self, latency='fixed:0', error_rate=0.0, rate_limit=0.0, max_concurrent=0, seed=None,
+                 verbose=False):
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel(latency, self.rng)
+        self.error_rate = error_rate
+        self.throttle = Throttle(rate_limit, max_concurrent)
+        self.verbose = verbose
+
+
+def start_mock_server(host='127.0.0.1', port=0, **config):
+    """在后台线程启动模拟服务，返回 (server, url)；port=0 时自动分配端口"""
+    server = ThreadingHTTPServer((host, port), MockOCRHandler)
+    server.daemon_threads = True
+    server.config = MockServerConfig(**config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_port}/ocr_api'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地模拟 OCR 服务')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=14141)
+    parser.add_argument('--latency', default='fixed:0', help='fixed:秒 | uniform:a,b | normal:均值,标准差 | lognormal:mu,sigma')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='返回 500 的概率')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='每秒最多处理的请求数，0 为不限')
+    parser.add_argument('--max-concurrent', type=int, default=0, help='最大并发请求数，0 为不限')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), MockOCRHandler)
+    server.daemon_threads = True
+    server.config = MockServerConfig(args.latency, args.error_rate, args.rate_limit, args.max_concurrent,
+                                     args.seed, args.verbose)
+    print(f'模拟 OCR 服务已启动: http://{args.host}:{server.server_port}/ocr_api')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
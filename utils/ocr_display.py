@@ -1,17 +1,19 @@
 # utils/ocr_display.py
-from utils.logs import LogBox
+import logging
+
+logger = logging.getLogger('yingwen.display')
 
 
 class OCRDisplay:
     def __init__(self, result_textbox):
         self.result_textbox = result_textbox
-        self.log_box = LogBox()
 
     def display_result(self, ocr_response):
-        self.log_box.log("开始显示OCR结果")
-        self.result_textbox.clear()
         ocr_texts = ocr_response['data']['texts']
-        for text in ocr_texts:
-            self.log_box.log(f"添加文本: {text}")
-            self.result_textbox.append(text)
-        self.log_box.log("OCR结果显示完成")
+        # 一次性设置全部文本；逐行 append 在行数多时会让界面卡顿
+        self.result_textbox.setPlainText('\n'.join(ocr_texts))
+        # 逐行明细只在开启调试级别时生成
+        if logger.isEnabledFor(logging.DEBUG):
+            for text in ocr_texts:
+                logger.debug('识别文本：%s', text)
+        logger.debug('OCR结果显示完成，共 %d 行', len(ocr_texts))
@@ -0,0 +1,353 @@
+# utils/ocr_table_model.py
+"""
+OCR 单字表格的模型/视图实现
+
+OCRTableModel 直接以 OCRWord 列表为数据，不为每行创建控件或条目；
+缩略图由 ThumbnailDelegate 只在绘制可见行时从 ThumbnailCache 取出，
+排序与按置信度筛选交给 ConfidenceFilterProxy。
+删除与修改都作为 QUndoCommand 推入模型的 undo_stack，成批执行、可撤销。
+"""
+
+import heapq
+
+from PyQt5.QtCore import QAbstractTableModel, QEvent, QModelIndex, QSortFilterProxyModel, Qt
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtWidgets import QStyle, QStyledItemDelegate, QUndoCommand, QUndoStack
+
+from utils.thumbnail_viewer import show_zoomed_pixmap
+
+THUMBNAIL_COLUMN, TEXT_COLUMN, CONFIDENCE_COLUMN = range(3)
+HEADERS = ('图像', 'OCR内容', '置信度')
+
+# 取出该行对应的 OCRWord
+WORD_ROLE = Qt.UserRole
+# 排序用的原始值：置信度为浮点数，其余为文字
+SORT_ROLE = Qt.UserRole + 1
+
+# 可撤销的步数；每步删除只保存被删行的引用
+UNDO_LIMIT = 50
+
+
+class OCRTableModel(QAbstractTableModel):
+    """单字结果表：每行对应一个 OCRWord，文字与置信度可直接编辑，修改写回所属单字表"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._words = []
+        # 每行的识别顺序号，按图像列排序时据此恢复原始顺序
+        self._order = []
+        self._next_order = 0
+        # 最近一次排序的列与顺序，分批追加的行按它插入到位；-1 为识别顺序
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self.undo_stack = QUndoStack(self)
+        self.undo_stack.setUndoLimit(UNDO_LIMIT)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._words)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return section + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        word = self._words[index.row()]
+        column = index.column()
+        if role == WORD_ROLE:
+            return word
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == TEXT_COLUMN:
+                return word.text
+            if column == CONFIDENCE_COLUMN:
+                return str(word.confidence)
+        elif role == SORT_ROLE:
+            if column == CONFIDENCE_COLUMN:
+                return word.confidence
+            if column == TEXT_COLUMN:
+                return word.text
+            return self._order[index.row()]
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() != THUMBNAIL_COLUMN:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        column = index.column()
+        if column == TEXT_COLUMN:
+            value = str(value)
+        elif column == CONFIDENCE_COLUMN:
+            try:
+                value = float(value)
+            except ValueError:
+                return False
+        else:
+            return False
+        self.undo_stack.push(EditWordsCommand(self, [self._words[index.row()]], column, [value], '修改单元格'))
+        return True
+
+    def words(self):
+        return list(self._words)
+
+    def word(self, row):
+        return self._words[row]
+
+    def setWords(self, words):
+        # 换成另一批结果后，旧的撤销记录不再对应当前行
+        self.undo_stack.clear()
+        self.beginResetModel()
+        self._words = list(words)
+        self._order = list(range(len(self._words)))
+        self._next_order = len(self._words)
+        if self._isSorted():
+            rows = self._sortedRows(range(len(self._words)))
+            self._words = [self._words[row] for row in rows]
+            self._order = [self._order[row] for row in rows]
+        self.endResetModel()
+
+    def appendWords(self, words):
+        words = list(words)
+        if not words:
+            return
+        start = len(self._words)
+        self.beginInsertRows(QModelIndex(), start, start + len(words) - 1)
+        self._words.extend(words)
+        self._order.extend(range(self._next_order, self._next_order + len(words)))
+        self._next_order += len(words)
+        self.endInsertRows()
+        if self._isSorted():
+            self._mergeTail(start)
+
+    def _mergeTail(self, start):
+        """已有的行保持有序，只需把 start 之后的行排好后归并进去，再以一次布局变化移到位"""
+        reverse = self._sort_order == Qt.DescendingOrder
+        keys = self._sortKeys(self._sort_column)
+        rows = heapq.merge(range(start), self._sortedRows(range(start, len(self._words)), keys),
+                           key=keys.__getitem__, reverse=reverse)
+        self._moveRows(list(rows))
+
+    def clear(self):
+        self.setWords([])
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or count <= 0 or row < 0 or row + count > len(self._words):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._words[row:row + count]
+        del self._order[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def removeRowSet(self, rows, description='删除行'):
+        """一次删除任意行号集合，可撤销；返回删除的行数"""
+        rows = sorted(set(rows))
+        if rows:
+            self.undo_stack.push(RemoveRowsCommand(self, rows, description))
+        return len(rows)
+
+    def setTexts(self, rows, text, description='批量修改文字'):
+        """把若干行的文字统一改为 text，可撤销"""
+        words = [self._words[row] for row in sorted(set(rows))]
+        if words:
+            self.undo_stack.push(EditWordsCommand(self, words, TEXT_COLUMN, [text] * len(words), description))
+        return len(words)
+
+    def rowsBelowConfidence(self, threshold):
+        return [row for row, word in enumerate(self._words) if word.table.confidences[word.index] < threshold]
+
+    def _takeRows(self, rows):
+        """删除升序行号 rows 并返回被删的单字与顺序号：连续的一段按段通知视图，否则整体重置一次"""
+        if not rows:
+            return [], []
+        words = [self._words[row] for row in rows]
+        orders = [self._order[row] for row in rows]
+        first, last = rows[0], rows[-1]
+        if last - first + 1 == len(rows):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._words[first:last + 1]
+            del self._order[first:last + 1]
+            self.endRemoveRows()
+        else:
+            removed = set(rows)
+            self.beginResetModel()
+            self._words = [word for row, word in enumerate(self._words) if row not in removed]
+            self._order = [order for row, order in enumerate(self._order) if row not in removed]
+            self.endResetModel()
+        return words, orders
+
+    def _restoreRows(self, words, orders):
+        """把 _takeRows 取出的单字按当前排序插回；未排序时按识别顺序号回到原位"""
+        if not words:
+            return
+        start = len(self._words)
+        self.beginInsertRows(QModelIndex(), start, start + len(words) - 1)
+        self._words.extend(words)
+        self._order.extend(orders)
+        self.endInsertRows()
+        self._mergeTail(start)
+
+    def _values(self, words, column):
+        if column == TEXT_COLUMN:
+            return [word.table.texts[word.index] for word in words]
+        return [float(word.table.confidences[word.index]) for word in words]
+
+    def _rowsOf(self, words):
+        """单字当前所在的行号（升序），不在表中的跳过"""
+        wanted = {(id(word.table), word.index) for word in words}
+        return [row for row, word in enumerate(self._words) if (id(word.table), word.index) in wanted]
+
+    def _writeValues(self, words, column, values):
+        """写回单字表，并以一个 dataChanged 覆盖所有受影响的行"""
+        for word, value in zip(words, values):
+            if column == TEXT_COLUMN:
+                word.table.texts[word.index] = value
+            else:
+                word.table.confidences[word.index] = value
+        rows = self._rowsOf(words)
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), column), self.index(max(rows), column),
+                                  [Qt.DisplayRole, Qt.EditRole])
+
+    def _isSorted(self):
+        """是否按识别顺序以外的方式排序；按识别顺序升序时追加的行本来就在正确位置"""
+        return self._sort_column in (CONFIDENCE_COLUMN, TEXT_COLUMN) or self._sort_order == Qt.DescendingOrder
+
+    def _sortKeys(self, column):
+        if column == CONFIDENCE_COLUMN:
+            return [word.table.confidences[word.index] for word in self._words]
+        if column == TEXT_COLUMN:
+            return [word.text for word in self._words]
+        return self._order
+
+    def _sortedRows(self, rows, keys=None):
+        if keys is None:
+            keys = self._sortKeys(self._sort_column)
+        return sorted(rows, key=keys.__getitem__, reverse=self._sort_order == Qt.DescendingOrder)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """一次取出整列排序键后排序，比代理逐对比较快得多；图像列按识别顺序排序"""
+        self._sort_column = column
+        self._sort_order = order
+        self._moveRows(self._sortedRows(range(len(self._words))))
+
+    def _moveRows(self, rows):
+        """按 rows（新顺序下各行原来的行号）重排，持久索引随之移动"""
+        self.layoutAboutToBeChanged.emit()
+        new_row = {old: new for new, old in enumerate(rows)}
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(persistent, [self.index(new_row[index.row()], index.column())
+                                                    for index in persistent])
+        self._words = [self._words[row] for row in rows]
+        self._order = [self._order[row] for row in rows]
+        self.layoutChanged.emit()
+
+    def findWord(self, word):
+        """返回单字所在行，不在表中时返回 -1"""
+        for row, row_word in enumerate(self._words):
+            if row_word.table is word.table and row_word.index == word.index:
+                return row
+        return -1
+
+
+class RemoveRowsCommand(QUndoCommand):
+    """删除一组行；按单字记录，撤销时按当前排序插回，期间排过序或追加过行仍然正确"""
+
+    def __init__(self, model, rows, description):
+        super().__init__(f'{description}（{len(rows)} 行）')
+        self.model = model
+        self.rows = rows
+        self.words = self.orders = None
+
+    def redo(self):
+        if self.words is not None:
+            # 撤销后可能又排过序，重做时按单字重新定位行号
+            self.rows = self.model._rowsOf(self.words)
+        self.words, self.orders = self.model._takeRows(self.rows)
+
+    def undo(self):
+        self.model._restoreRows(self.words, self.orders)
+
+
+class EditWordsCommand(QUndoCommand):
+    """修改一组单字的文字或置信度；按单字而不是行号记录，排序后撤销仍然正确"""
+
+    def __init__(self, model, words, column, values, description):
+        super().__init__(description)
+        self.model = model
+        self.words = words
+        self.column = column
+        self.values = values
+        self.old_values = model._values(words, column)
+
+    def redo(self):
+        self.model._writeValues(self.words, self.column, self.values)
+
+    def undo(self):
+        self.model._writeValues(self.words, self.column, self.old_values)
+
+
+class ConfidenceFilterProxy(QSortFilterProxyModel):
+    """按置信度区间筛选行；排序转交源模型整体完成，代理本身保持源模型顺序"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.minimum = 0.0
+        self.maximum = 1.0
+        self.setSortRole(SORT_ROLE)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    def setConfidenceRange(self, minimum, maximum):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.minimum <= 0.0 and self.maximum >= 1.0:
+            return True
+        confidence = self.sourceModel().word(source_row).confidence
+        return self.minimum <= confidence <= self.maximum
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """绘制单字缩略图：只有行进入可见区域、真正绘制时才向缓存取图，单击放大查看"""
+
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+
+    def paint(self, painter, option, index):
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        word = index.data(WORD_ROLE)
+        if word is None:
+            return
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        # 按单元格尺寸从缓存取缩放好的图，绘制时不再缩放
+        image = self.cache.get(word, rect.size())
+        if image.isNull():
+            return
+        x = rect.x() + (rect.width() - image.width()) // 2
+        y = rect.y() + (rect.height() - image.height()) // 2
+        painter.drawImage(x, y, image)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            word = index.data(WORD_ROLE)
+            if word is not None:
+                show_zoomed_pixmap(QPixmap.fromImage(self.cache.get(word)), self.parent())
+                return True
+        return super().editorEvent(event, model, option, index)
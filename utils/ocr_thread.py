@@ -7,10 +7,13 @@ from image_models.image_ocr_processor import ImageOCRProcessor
 class OCRThread(QThread):
     result_signal = pyqtSignal(object)
 
-    def __init__(self, image_path, api_token, email, log_box, image_size, char_ocr, det_mode, return_position, return_choices):
+    def __init__(self, image, api_token, email, log_box, image_size, char_ocr, det_mode, return_position, return_choices,
+                 client=None, cache=None, preparer=None, tile_size=None, preprocessor=None):
         super().__init__()
-        self.image_path = image_path
-        self.ocr_processor = ImageOCRProcessor(api_token, email, log_box)
+        # 图像路径或 PageImage
+        self.image = image
+        self.ocr_processor = ImageOCRProcessor(api_token, email, log_box, client, cache, preparer,
+                                               tile_size=tile_size, preprocessor=preprocessor)
         self.image_size = image_size
         self.char_ocr = char_ocr
         self.det_mode = det_mode
@@ -19,6 +22,6 @@ class OCRThread(QThread):
         self.log_box = log_box
 
     def run(self):
-        response = self.ocr_processor.process_single_image(self.image_path, self.image_size, self.char_ocr,
+        response = self.ocr_processor.process_single_image(self.image, self.image_size, self.char_ocr,
                                                            self.det_mode, self.return_position, self.return_choices)
         self.result_signal.emit(response)
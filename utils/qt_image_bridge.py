@@ -0,0 +1,120 @@
+# utils/qt_image_bridge.py
+"""
+PIL / NumPy 与 Qt 图像之间的直接转换：按行跨度包装原始像素缓冲区，不经过 PNG 编解码
+
+模块本身不导入 PIL 与 NumPy，启动时导入它不会拖慢首屏。
+"""
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PyQt5.QtGui import QImage, QPixmap
+
+# PIL 模式 -> (QImage 格式, 每像素字节数)
+_PIL_FORMATS = {
+    'L': (QImage.Format_Grayscale8, 1),
+    'RGB': (QImage.Format_RGB888, 3),
+    'RGBA': (QImage.Format_RGBA8888, 4),
+}
+
+# 上传格式 -> Qt 写入格式；'original' 不重新压缩，由 encode_for_upload 单独处理
+_UPLOAD_WRITER_FORMATS = {'PNG': 'PNG', 'JPEG': 'JPG', 'WEBP': 'WEBP'}
+
+
+def _wrap(data, width, height, bytes_per_line, fmt):
+    """用 QImage 包装一块像素内存；QImage 不持有数据，需把缓冲区挂在对象上保活"""
+    image = QImage(data, width, height, bytes_per_line, fmt)
+    image._buffer = data
+    return image
+
+
+def pil_to_qimage(image):
+    """PIL 图像 -> QImage，共享 tobytes() 得到的像素缓冲区"""
+    if image.mode not in _PIL_FORMATS:
+        if image.mode in ('LA', 'PA') or 'transparency' in image.info:
+            image = image.convert('RGBA')
+        elif image.mode in ('1', 'I', 'I;16', 'F'):
+            image = image.convert('L')
+        else:
+            image = image.convert('RGB')
+    fmt, depth = _PIL_FORMATS[image.mode]
+    width, height = image.size
+    return _wrap(image.tobytes(), width, height, width * depth, fmt)
+
+
+def pil_to_pixmap(image):
+    return QPixmap.fromImage(pil_to_qimage(image))
+
+
+def ndarray_to_qimage(array):
+    """uint8 数组 (H, W) / (H, W, 3) / (H, W, 4) -> QImage，直接引用数组内存"""
+    if array.ndim == 2:
+        fmt = QImage.Format_Grayscale8
+    elif array.ndim == 3 and array.shape[2] in (3, 4):
+        fmt = QImage.Format_RGB888 if array.shape[2] == 3 else QImage.Format_RGBA8888
+    else:
+        raise ValueError(f'不支持的数组形状: {array.shape}')
+    if array.dtype.name != 'uint8':
+        raise ValueError(f'只支持 uint8 数组，收到 {array.dtype}')
+    if not array.flags['C_CONTIGUOUS'] or array.strides[1] != array.itemsize * (array.shape[2] if array.ndim == 3 else 1):
+        array = array.copy()
+    height, width = array.shape[:2]
+    image = QImage(array.ctypes.data, width, height, array.strides[0], fmt)
+    image._buffer = array
+    return image
+
+
+def qimage_to_pil(qimage):
+    """QImage -> PIL 图像，按行跨度读取像素，只复制一次"""
+    from PIL import Image
+
+    if qimage.isNull():
+        return None
+    if qimage.format() == QImage.Format_Grayscale8:
+        mode = 'L'
+    elif qimage.hasAlphaChannel():
+        qimage = qimage.convertToFormat(QImage.Format_RGBA8888)
+        mode = 'RGBA'
+    else:
+        qimage = qimage.convertToFormat(QImage.Format_RGB888)
+        mode = 'RGB'
+    bits = qimage.constBits()
+    bits.setsize(qimage.bytesPerLine() * qimage.height())
+    return Image.frombytes(mode, (qimage.width(), qimage.height()), bits.asstring(), 'raw', mode,
+                           qimage.bytesPerLine())
+
+
+def pixmap_to_pil(pixmap):
+    if pixmap is None or pixmap.isNull():
+        return None
+    return qimage_to_pil(pixmap.toImage())
+
+
+def encode_for_upload(image, fmt='PNG', quality=85, grayscale=False, max_side=None):
+    """QImage / QPixmap -> 待上传的已编码字节，全程在内存中完成，不经过临时文件
+
+    长边超过 max_side 时先等比缩小；Qt 不支持所选格式（如缺少 WebP 插件）时退回 PNG。
+    fmt 为 'original' 时与文件上传一致，不缩放、不转灰度，按原尺寸无损编码。
+    """
+    if isinstance(image, QPixmap):
+        image = image.toImage()
+    if fmt == 'original':
+        return encode_qimage(image, 'PNG')
+    if max_side and max(image.width(), image.height()) > max_side:
+        image = image.scaled(max_side, max_side, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    if grayscale:
+        image = image.convertToFormat(QImage.Format_Grayscale8)
+
+    writer_format = _UPLOAD_WRITER_FORMATS.get(fmt, 'PNG')
+    data = encode_qimage(image, writer_format, -1 if writer_format == 'PNG' else quality)
+    if data is None and writer_format != 'PNG':
+        return encode_qimage(image, 'PNG')
+    return data
+
+
+def encode_qimage(image, fmt='PNG', quality=-1):
+    """QImage -> 编码后的字节，写入内存缓冲区；Qt 不支持该格式时返回 None"""
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    saved = image.save(buffer, fmt, quality)
+    buffer.close()
+    return bytes(data) if saved else None
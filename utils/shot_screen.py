@@ -1,5 +1,6 @@
 import sys
 import os
+import threading
 import time
 from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QWidget, QRubberBand, QDesktopWidget)
@@ -301,9 +302,29 @@ class QuickScreenshot:
         except Exception as e:
             print(f"保存截图失败: {e}")
             return None
+
+    def save_screenshot_async(self, pixmap, filename=None):
+        """在后台线程中编码并保存截图，立即返回将要写入的路径"""
+        if pixmap is None or pixmap.isNull():
+            return None
+
+        if filename is None:
+            filename = self._generate_filename()
+        os.makedirs(self.save_directory, exist_ok=True)
+        save_path = os.path.abspath(os.path.join(self.save_directory, filename))
+
+        # QPixmap 只能在主线程使用，先转为 QImage 再交给后台线程
+        image = pixmap.toImage()
+
+        def save():
+            if not image.save(save_path):
+                print(f"保存截图失败: {save_path}")
+
+        threading.Thread(target=save, daemon=True).start()
+        return save_path
         
-    def take_area_screenshot(self):
-        """进行区域截图，返回(pixmap, save_path)"""
+    def take_area_screenshot(self, save=True):
+        """进行区域截图，返回(pixmap, save_path)；save 为 False 时不保存，save_path 为 None"""
         app = QApplication.instance()
         if not app:
             app = QApplication(sys.argv)
@@ -327,6 +348,8 @@ class QuickScreenshot:
         
         if self.is_cancelled or self.result_pixmap is None:
             return None, None
+        if not save:
+            return self.result_pixmap, None
         
         # 保存截图
         save_path = self._save_screenshot(self.result_pixmap, self._generate_filename("area_screenshot"))
@@ -361,10 +384,15 @@ class QuickScreenshot:
         self.is_cancelled = True
 
 # 便捷函数
-def take_area_screenshot(save_directory=None):
+def take_area_screenshot(save_directory=None, save=True):
     """便捷的区域截图函数，返回(pixmap, save_path)"""
     screenshot_tool = QuickScreenshot(save_directory)
-    return screenshot_tool.take_area_screenshot()
+    return screenshot_tool.take_area_screenshot(save)
+
+def save_screenshot_async(pixmap, save_directory=None):
+    """在后台保存区域截图，返回将要写入的路径"""
+    screenshot_tool = QuickScreenshot(save_directory)
+    return screenshot_tool.save_screenshot_async(pixmap, screenshot_tool._generate_filename("area_screenshot"))
 
 def take_full_screenshot(save_directory=None):
     """便捷的全屏截图函数（所有屏幕），返回(pixmap, save_path)"""
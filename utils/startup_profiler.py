@@ -0,0 +1,90 @@
+# utils/startup_profiler.py
+
+import builtins
+import sys
+import time
+
+
+class StartupProfiler:
+    """启动耗时分析：统计各顶层模块的导入耗时以及到首次绘制的各阶段耗时
+
+    由 main.py 的 --profile-startup 开关启用，未启用时所有方法都是空操作。
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.marks = []
+        self.import_times = {}
+        self._depth = 0
+        self._original_import = None
+        if enabled:
+            self._install_import_hook()
+
+    @classmethod
+    def from_argv(cls, argv, flag='--profile-startup'):
+        enabled = flag in argv
+        if enabled:
+            argv.remove(flag)
+        return cls(enabled)
+
+    def _install_import_hook(self):
+        self._original_import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # 只统计最外层、首次导入的模块，嵌套导入的耗时计入其顶层模块
+            if self._depth or level or name in sys.modules:
+                return self._original_import(name, globals, locals, fromlist, level)
+            self._depth += 1
+            begin = time.perf_counter()
+            try:
+                return self._original_import(name, globals, locals, fromlist, level)
+            finally:
+                self._depth -= 1
+                top_level = name.partition('.')[0]
+                self.import_times[top_level] = self.import_times.get(top_level, 0.0) + time.perf_counter() - begin
+
+        builtins.__import__ = timed_import
+
+    def mark(self, name):
+        if self.enabled:
+            self.marks.append((name, time.perf_counter()))
+
+    def watch_first_paint(self, widget):
+        """窗口第一次绘制时记录时间并输出报告"""
+        if not self.enabled:
+            return
+        # 在这里才导入 Qt，使 PyQt5 本身的导入耗时也能被统计到
+        from PyQt5.QtCore import QEvent, QObject, QTimer
+
+        profiler = self
+
+        class FirstPaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint:
+                    obj.removeEventFilter(self)
+                    profiler.mark('首次绘制')
+                    # 等本轮绘制结束后再输出
+                    QTimer.singleShot(0, profiler.report)
+                return False
+
+        self._paint_filter = FirstPaintFilter()
+        widget.installEventFilter(self._paint_filter)
+
+    def report(self):
+        if not self.enabled:
+            return
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+        print('=== 启动耗时 ===', file=sys.stderr)
+        previous = self.start
+        for name, moment in self.marks:
+            print(f'{name:<24}{(moment - previous) * 1000:>9.1f} ms  (累计 {(moment - self.start) * 1000:.1f} ms)',
+                  file=sys.stderr)
+            previous = moment
+
+        print('=== 模块导入耗时 ===', file=sys.stderr)
+        for name, seconds in sorted(self.import_times.items(), key=lambda item: item[1], reverse=True)[:20]:
+            print(f'{name:<24}{seconds * 1000:>9.1f} ms', file=sys.stderr)
@@ -1,54 +1,109 @@
-from PyQt5.QtWidgets import QMenu, QAction
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QMenu, QAction, QInputDialog
+from PyQt5.QtCore import Qt, QModelIndex
+from PyQt5.QtGui import QKeySequence
 
 
 class TableOperationsMixin:
-    """表格操作混入类"""
-    
+    """表格操作混入类：删除、按置信度删除/保留、批量改字，均成批执行并可撤销"""
+
     def setup_table_context_menu(self, table):
-        """为表格设置右键菜单"""
+        """为表格设置右键菜单与撤销、重做、删除快捷键"""
         table.setContextMenuPolicy(Qt.CustomContextMenu)
         table.customContextMenuRequested.connect(lambda pos: self.show_context_menu(pos, table))
-        
+
         # 设置表格选择模式，允许多选
         table.setSelectionBehavior(table.SelectRows)  # 按行选择
         table.setSelectionMode(table.ExtendedSelection)  # 允许多选
-    
+
+        undo_stack = self.source_model(table).undo_stack
+        self.table_undo_action = undo_stack.createUndoAction(table, '撤销')
+        self.table_redo_action = undo_stack.createRedoAction(table, '重做')
+        delete_action = QAction('删除选中行', table)
+        delete_action.triggered.connect(lambda: self.delete_selected_rows(table))
+        for action, key in ((self.table_undo_action, QKeySequence.Undo), (self.table_redo_action, QKeySequence.Redo),
+                            (delete_action, QKeySequence.Delete)):
+            action.setShortcut(key)
+            action.setShortcutContext(Qt.WidgetWithChildrenShortcut)
+            table.addAction(action)
+
     def show_context_menu(self, position, table):
         """显示右键菜单"""
-        if table.itemAt(position) is not None:
-            menu = QMenu()
-            
+        menu = QMenu()
+        if table.indexAt(position).isValid():
             # 获取选中的行数
             selected_rows = self.get_selected_rows(table)
-            
+
             if len(selected_rows) == 1:
                 delete_action = QAction("删除此行", self)
             else:
                 delete_action = QAction(f"删除选中的 {len(selected_rows)} 行", self)
-            
+
             delete_action.triggered.connect(lambda: self.delete_selected_rows(table))
             menu.addAction(delete_action)
-            
-            # 在鼠标位置显示菜单
-            menu.exec_(table.mapToGlobal(position))
+
+            edit_action = QAction(f"修改选中 {len(selected_rows)} 行的文字...", self)
+            edit_action.triggered.connect(lambda: self.edit_selected_texts(table))
+            menu.addAction(edit_action)
+            menu.addSeparator()
+
+        below_action = QAction("删除置信度低于...的行", self)
+        below_action.triggered.connect(lambda: self.delete_below_confidence(table))
+        menu.addAction(below_action)
+        keep_action = QAction("仅保留当前筛选范围内的行", self)
+        keep_action.triggered.connect(lambda: self.keep_filtered_rows(table))
+        menu.addAction(keep_action)
+        menu.addSeparator()
+        menu.addAction(self.table_undo_action)
+        menu.addAction(self.table_redo_action)
+
+        # 在鼠标位置显示菜单
+        menu.exec_(table.mapToGlobal(position))
+
+    def source_model(self, table):
+        model = table.model()
+        return model.sourceModel() if hasattr(model, 'sourceModel') else model
 
     def get_selected_rows(self, table):
-        """获取选中的行索引列表"""
-        selected_rows = []
-        for item in table.selectedItems():
-            row = item.row()
-            if row not in selected_rows:
-                selected_rows.append(row)
-        return sorted(selected_rows, reverse=True)  # 从大到小排序，这样删除时不会影响索引
+        """按选区范围取出选中行在源模型中的行号（升序），不逐个单元格遍历"""
+        model = table.model()
+        rows = set()
+        for selection_range in table.selectionModel().selection():
+            for row in range(selection_range.top(), selection_range.bottom() + 1):
+                if hasattr(model, 'mapToSource'):
+                    rows.add(model.mapToSource(model.index(row, 0)).row())
+                else:
+                    rows.add(row)
+        return sorted(rows)
 
     def delete_selected_rows(self, table):
-        """删除选中的行"""
+        """删除选中的行，一次完成"""
+        selected_rows = self.get_selected_rows(table)
+        if selected_rows:
+            self.source_model(table).removeRowSet(selected_rows, '删除选中行')
+
+    def edit_selected_texts(self, table):
+        """把选中行的文字统一改为输入的内容"""
         selected_rows = self.get_selected_rows(table)
-        
         if not selected_rows:
             return
-        
-        # 从大到小删除，避免索引变化的问题
-        for row in selected_rows:
-            table.removeRow(row)
\ No newline at end of file
+        model = self.source_model(table)
+        text, ok = QInputDialog.getText(self, '批量修改文字', f'将选中的 {len(selected_rows)} 行改为:',
+                                        text=model.word(selected_rows[0]).text)
+        if ok:
+            model.setTexts(selected_rows, text)
+
+    def delete_below_confidence(self, table):
+        """删除置信度低于输入阈值的所有行（不论是否被筛选隐藏）"""
+        threshold, ok = QInputDialog.getDouble(self, '按置信度删除', '删除置信度低于此值的行:', 0.5, 0.0, 1.0, 2)
+        if ok:
+            model = self.source_model(table)
+            model.removeRowSet(model.rowsBelowConfidence(threshold), f'删除置信度低于 {threshold:.2f} 的行')
+
+    def keep_filtered_rows(self, table):
+        """删除被当前置信度筛选隐藏的行"""
+        model = table.model()
+        if not hasattr(model, 'filterAcceptsRow'):
+            return
+        source = model.sourceModel()
+        rows = [row for row in range(source.rowCount()) if not model.filterAcceptsRow(row, QModelIndex())]
+        source.removeRowSet(rows, '仅保留筛选范围内的行')
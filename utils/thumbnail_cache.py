@@ -0,0 +1,93 @@
+# utils/thumbnail_cache.py
+
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
+
+from utils.qt_image_bridge import encode_qimage, pil_to_qimage
+
+# 默认内存上限（MB），可在 config.ini 的 thumbnail_cache_mb 中修改
+DEFAULT_BUDGET_MB = 128
+
+
+class ThumbnailCache:
+    """单字缩略图的共享缓存：键为 (单字表, 下标, 目标尺寸)，按占用字节数做 LRU 淘汰
+
+    表格委托、放大对话框与 Excel 导出都从这里取图，同一尺寸只缩放一次。
+    保存 QImage 而不是 QPixmap，导出线程也可以安全读取。
+    """
+
+    def __init__(self, max_bytes=DEFAULT_BUDGET_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def setBudget(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def get(self, word, size=None):
+        """
+        Args:
+            word: OCRWord
+            size: 目标尺寸 (宽, 高) 或 QSize，等比缩小到其内，不放大；为 None 时返回原尺寸切图
+        Returns:
+            QImage
+        """
+        if size is not None and not isinstance(size, tuple):
+            size = (size.width(), size.height())
+        key = (word.table, word.index, size)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image
+
+        if size is None:
+            image = self._load(word)
+        else:
+            # 缩放时借用已缓存的原尺寸切图，但不为此缓存原图，以免滚动表格时大图挤掉小缩略图
+            with self._lock:
+                image = self._images.get((word.table, word.index, None))
+            if image is None:
+                image = self._load(word)
+            width, height = max(1, size[0]), max(1, size[1])
+            # 已能放进目标尺寸的小字不放大，原图直接以该尺寸为键缓存，重绘时不再重新切图
+            if image.width() > width or image.height() > height:
+                image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        with self._lock:
+            if key not in self._images:
+                self._images[key] = image
+                self.used_bytes += image.sizeInBytes()
+                self._evict()
+        return image
+
+    def encoded(self, word, size, fmt='PNG'):
+        """取出缩放后的图并编码为字节，供导出使用"""
+        return encode_qimage(self.get(word, size), fmt)
+
+    def _load(self, word):
+        thumbnails = word.table.thumbnails
+        if thumbnails is not None:
+            # 进程池后处理时已编码好缩略图，只解码这一小块，不必解码整页
+            return QImage.fromData(thumbnails[word.index], 'PNG')
+        return pil_to_qimage(word.image)
+
+    def _evict(self):
+        # 至少保留最近放入的一项
+        while self.used_bytes > self.max_bytes and len(self._images) > 1:
+            _, image = self._images.popitem(last=False)
+            self.used_bytes -= image.sizeInBytes()
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self.used_bytes = 0
+
+    def __len__(self):
+        return len(self._images)
@@ -32,15 +32,22 @@ class ThumbnailViewer(QLabel):
 
     def showZoomedDialog(self):
         if self.original_pixmap:
-            dialog = QDialog(self)
-            dialog.setWindowTitle("放大图像")
-            layout = QVBoxLayout()
-            label = QLabel()
-            label.setPixmap(self.original_pixmap)
-            layout.addWidget(label)
-            dialog.setLayout(layout)
-            dialog.exec_()  # 显示为模态对话框
+            show_zoomed_pixmap(self.original_pixmap, self)
 
     def resizeEvent(self, event):
         if not self.is_zoomed_in:
             self.updateThumbnail(self.size())
+
+
+def show_zoomed_pixmap(pixmap, parent=None):
+    """以模态对话框显示原尺寸图像"""
+    if pixmap is None or pixmap.isNull():
+        return
+    dialog = QDialog(parent)
+    dialog.setWindowTitle("放大图像")
+    layout = QVBoxLayout()
+    label = QLabel()
+    label.setPixmap(pixmap)
+    layout.addWidget(label)
+    dialog.setLayout(layout)
+    dialog.exec_()  # 显示为模态对话框
@@ -0,0 +1,39 @@
+# yingwen/__init__.py
+"""
+影文OCR 的无界面接口：不导入 PyQt，可在没有显示器的服务器上使用
+
+    from yingwen import ImageOCRProcessor, BatchOCREngine
+
+各名称在首次访问时才导入对应模块，命令行启动不必加载 openpyxl 等重量级依赖。
+"""
+
+import importlib
+
+_EXPORTS = {
+    'AsyncImageOCRProcessor': 'image_models.async_ocr_processor',
+    'BatchOCREngine': 'image_models.batch_ocr',
+    'PageResult': 'image_models.batch_ocr',
+    'collect_image_paths': 'image_models.batch_ocr',
+    'PageGeometry': 'image_models.box_geometry',
+    'ImageOCRProcessor': 'image_models.image_ocr_processor',
+    'OCRResponseCache': 'image_models.ocr_cache',
+    'OCRPage': 'image_models.ocr_result',
+    'OCRWord': 'image_models.ocr_result',
+    'OCRWordTable': 'image_models.ocr_result',
+    'OCR_API_URL': 'image_models.ocr_client',
+    'OCRClient': 'image_models.ocr_client',
+    'UploadPreparer': 'image_models.upload_preparer',
+    'ImageProcessor': 'image_processor',
+    'save_to_excel': 'utils.excel_writer',
+    'write_excel': 'utils.excel_writer',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'yingwen' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,7 @@
+# yingwen/__main__.py
+
+import sys
+
+from yingwen.cli import main
+
+sys.exit(main())
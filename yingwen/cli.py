@@ -0,0 +1,205 @@
+# yingwen/cli.py
+"""
+命令行入口（不依赖 PyQt）
+
+    python -m yingwen ocr images/某书 --out results.jsonl --xlsx out.xlsx
+"""
+
+import argparse
+import configparser
+import json
+import logging
+import os
+import sys
+import time
+
+DEFAULT_CONFIG = 'config.ini'
+
+
+class ConsoleLog:
+    """代替 GUI 的 LogBox，把日志写到标准错误；WARNING 及以上总是输出，INFO、DEBUG 仅在 -v 时输出"""
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+
+    def log(self, message, level=logging.INFO):
+        if level >= logging.WARNING or self.verbose:
+            print(message, file=sys.stderr)
+
+
+def load_config(path):
+    """读取 GUI 保存的 config.ini（QSettings 的 [General] 节），不存在时返回空字典"""
+    parser = configparser.ConfigParser(interpolation=None)
+    if not path or not os.path.exists(path):
+        return {}
+    parser.read(path, encoding='utf-8')
+    return dict(parser['General']) if parser.has_section('General') else {}
+
+
+def _as_bool(value, default):
+    if value is None:
+        return default
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='yingwen', description='影文OCR 命令行')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ocr = subparsers.add_parser('ocr', help='识别图像文件或目录')
+    ocr.add_argument('paths', nargs='+', help='图像文件或目录（目录按页码自然排序）')
+    ocr.add_argument('--out', help='逐页写出 JSON Lines 结果')
+    ocr.add_argument('--xlsx', help='导出单字切图与识别结果到 Excel')
+    ocr.add_argument('--config', default=DEFAULT_CONFIG, help='读取 GUI 的配置文件（默认 config.ini）')
+    ocr.add_argument('--token', help='API Token，默认取配置文件')
+    ocr.add_argument('--email', help='登录账号，默认取配置文件')
+    ocr.add_argument('--api-url', help='OCR 接口地址，默认取配置文件')
+    ocr.add_argument('--det-mode', choices=('auto', 'sp', 'hp'), help='文字排版方向')
+    ocr.add_argument('--image-size', type=int, help='图片尺寸')
+    ocr.add_argument('--line-ocr', action='store_true', help='使用文本行检测识别（默认单字）')
+    ocr.add_argument('--workers', type=int, help='并发数')
+    ocr.add_argument('--upload-format', choices=('original', 'JPEG', 'WEBP', 'PNG'), help='上传格式')
+    ocr.add_argument('--upload-quality', type=int, help='上传质量')
+    ocr.add_argument('--tile-size', type=int, help='长边超过该值的页面分块识别，0 为关闭')
+    for step, flag, label in (('deskew', '--deskew', '纠斜'), ('crop_margins', '--crop-margins', '裁去页边'),
+                              ('contrast', '--contrast', '增强对比'), ('binarize', '--binarize', '自适应二值化'),
+                              ('despeckle', '--despeckle', '去噪点')):
+        ocr.add_argument(flag, dest=step, action='store_true', default=None, help=f'上传前{label}')
+    ocr.add_argument('--no-cache', action='store_true', help='不使用本地 OCR 响应缓存')
+    ocr.add_argument('--async', dest='async_upload', action='store_true',
+                     help='在单个事件循环中并发上传（需要 aiohttp），并发数不受 --workers 限制')
+    ocr.add_argument('--rps', type=float, default=5.0, help='--async 时每秒最多发出的请求数（默认 5）')
+    ocr.add_argument('--in-flight', type=int, default=32, help='--async 时同时进行的最多请求数（默认 32）')
+    ocr.add_argument('-v', '--verbose', action='store_true', help='同时输出 INFO、DEBUG 日志（警告与错误总是输出）')
+    return parser
+
+
+def _page_record(result):
+    """把一页结果整理为 JSON 记录，坐标换算为原图像素"""
+    record = {'page': result.index + 1, 'path': result.image_path, 'elapsed': round(result.elapsed, 3)}
+    if not result.ok:
+        record['error'] = result.error
+        return record
+
+    from image_models.box_geometry import PageGeometry
+    from image_models.page_image import PageImage
+
+    data = result.response['data']
+    # 复用识别时的页面句柄，只读文件头，不再重新打开图像
+    width, height = (result.page_image or PageImage(result.image_path)).size
+    geometry = PageGeometry(result.response, (width, height))
+
+    words = [{'text': text, 'confidence': confidence, 'line': line, 'box': box}
+             for text, confidence, line, box in zip(geometry.word_texts, geometry.word_confidences.tolist(),
+                                                    geometry.word_line.tolist(), geometry.word_rects().tolist())]
+    record.update({'width': width, 'height': height, 'texts': data['texts'], 'words': words})
+    return record
+
+
+def run_ocr(args):
+    from image_models.batch_ocr import BatchOCREngine, collect_image_paths
+    from image_models.constants import PREPROCESS_STEPS
+    from image_models.image_ocr_processor import ImageOCRProcessor
+    from image_models.ocr_cache import OCRResponseCache
+    from image_models.ocr_client import OCR_API_URL, OCRClient
+    from image_models.upload_preparer import UploadPreparer
+
+    config = load_config(args.config)
+    paths = collect_image_paths(args.paths)
+    if not paths:
+        print('没有找到图像文件', file=sys.stderr)
+        return 1
+
+    workers = args.workers or int(config.get('batch_workers', 4))
+    client = OCRClient(url=args.api_url or config.get('api_url') or OCR_API_URL, pool_size=max(8, workers))
+    cache = None if args.no_cache else OCRResponseCache()
+    upload_format = args.upload_format or config.get('upload_format', 'JPEG')
+    preparer = None
+    if upload_format != 'original':
+        preparer = UploadPreparer(upload_format, args.upload_quality or int(config.get('upload_quality', 85)),
+                                  _as_bool(config.get('upload_grayscale'), True))
+
+    preprocessor = None
+    steps = {step: getattr(args, step) or _as_bool(config.get(f'preprocess_{step}'), False)
+             for step in PREPROCESS_STEPS}
+    if any(steps.values()):
+        from image_models.preprocess import Preprocessor
+        preprocessor = Preprocessor(**steps)
+
+    processor = ImageOCRProcessor(args.token or config.get('api_token', ''), args.email or config.get('email', ''),
+                                  ConsoleLog(args.verbose), client, cache, preparer,
+                                  tile_size=(args.tile_size if args.tile_size is not None
+                                             else int(config.get('tile_size', 0))) or None,
+                                  preprocessor=preprocessor)
+    ocr_options = {
+        'image_size': args.image_size or int(config.get('image_size', 1024)),
+        'char_ocr': False if args.line_ocr else _as_bool(config.get('char_ocr'), True),
+        'det_mode': args.det_mode or config.get('det_mode', 'auto'),
+        'return_position': True,
+        'return_choices': True,
+    }
+    async_processor = None
+    if args.async_upload:
+        try:
+            from image_models.async_ocr_processor import AsyncImageOCRProcessor
+        except ImportError:
+            print('--async 需要安装 aiohttp', file=sys.stderr)
+            return 1
+        async_processor = AsyncImageOCRProcessor(processor, requests_per_second=args.rps,
+                                                 max_in_flight=args.in_flight)
+    # 只有导出 Excel 时才需要切字
+    engine = BatchOCREngine(processor, ocr_options, workers, post_process=bool(args.xlsx),
+                            async_processor=async_processor)
+
+    out_file = open(args.out, 'w', encoding='utf-8') if args.out else None
+    excel_rows = []
+
+    def on_page(result):
+        record = _page_record(result)
+        if out_file:
+            out_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out_file.flush()
+        else:
+            print(json.dumps(record, ensure_ascii=False))
+        if args.xlsx and result.ok:
+            excel_rows.extend(result.page.words.rows())
+            result.page.release_image()
+
+    def on_progress(done, total, pages_per_minute):
+        print(f'\r{done}/{total} 页  {pages_per_minute:.1f} 页/分钟', end='', file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    try:
+        results = engine.run(paths, on_page=on_page, on_progress=on_progress)
+    except KeyboardInterrupt:
+        engine.cancel()
+        print('\n已中断', file=sys.stderr)
+        return 130
+    finally:
+        if out_file:
+            out_file.close()
+        client.close()
+        if cache is not None:
+            cache.close()
+
+    print(file=sys.stderr)
+    if args.xlsx:
+        from utils.excel_writer import write_excel
+        write_excel(excel_rows, args.xlsx)
+
+    failed = sum(1 for result in results if not result.ok)
+    elapsed = time.perf_counter() - start
+    stats = client.get_stats()
+    if async_processor is not None:
+        async_stats = async_processor.get_stats()
+        stats = {name: stats[name] + async_stats[name] for name in ('requests', 'retries')}
+    print(f'完成 {len(results)} 页，失败 {failed} 页，用时 {elapsed:.1f} 秒，'
+          f'请求 {stats["requests"]} 次，重试 {stats["retries"]} 次', file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'ocr':
+        return run_ocr(args)
+    return 2